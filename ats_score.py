@@ -0,0 +1,348 @@
+"""ATS keyword matching of resumes against job postings.
+
+Resumes and postings are tokenized into keyword terms: words, plus the canonical name of any
+taxonomy skill or synonym found in the text. For example, "Spark (Python)" also yields
+"pyspark". The terms are held as sparse NumPy arrays and scored all at once:
+
+* ``bm25``: Okapi BM25 of each posting's keywords over the resume collection (ranking).
+* ``tfidf``: cosine similarity of sublinear TF-IDF vectors.
+* ``coverage``: the share of a posting's keywords the resume contains, each weighted by how
+  rare it is across the postings (0-1, what an ATS match percentage shows).
+
+    python ats_score.py --resumes cohort.jsonl --postings postings/ --top 5 --output matches.jsonl
+
+Resumes are bulk_generate records (.jsonl/.csv) or .docx files (a file, directory or ZIP).
+Postings are .txt files (a file or directory) or a .jsonl file of {"id": ..., "text": ...}.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from resume_template import SKILLS, instruction_fields, load_template
+from skill_taxonomy import load_taxonomy, normalize
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*')
+STOPWORDS = frozenset('''
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each etc few for from further had has have having he her here
+hers him his how i if in into is it its itself just may me more most must my no nor not now of off on once only
+or other our ours out over own per same she should so some such than that the their theirs them then there these
+they this those through to too under until up us very via was we were what when where which while who whom why
+will with within would you your yours
+'''.split())
+SINGLE_LETTER_TERMS = frozenset('cr')
+# Fields whose text is scored; names, contact details, company names, dates and education are not keywords
+KEYWORD_FIELDS = frozenset(['summary', 'certifications', 'additional_skills', 'profile', 'jd'])
+# Upper bounds on one scoring chunk: gathered index entries and score cells
+CHUNK_ENTRIES = 1 << 22
+CHUNK_CELLS = 1 << 22
+# Keywords in at least this share of the resumes are scored with dense matrix products instead
+DENSE_FRACTION = 0.02
+DENSE_MIN_RESUMES = 64
+
+
+class KeywordTokenizer:
+    """Splits text into keyword terms, adding the canonical names of taxonomy skills it mentions."""
+
+    def __init__(self, taxonomy):
+        self.skills = {}
+        for alias, name in taxonomy.aliases.items():
+            words = tuple(TOKEN.findall(alias))
+            if words:
+                self.skills.setdefault(words, normalize(name))
+        self.skill_terms = frozenset(self.skills.values())
+        self.first_words = frozenset(words[0] for words in self.skills)
+        self.longest = min(max((len(words) for words in self.skills), default=1), 4)
+
+    def __call__(self, text):
+        words = TOKEN.findall(str(text).casefold())
+        terms = [word for word in words
+                 if word not in STOPWORDS and (len(word) > 1 or word in SINGLE_LETTER_TERMS)
+                 and not word.replace('.', '').isdigit()]
+        covered = 0
+        for i, word in enumerate(words):
+            if i < covered or word not in self.first_words:
+                continue
+            # Longest skill alias starting here wins, so "azure data factory" is not also "azure"
+            for size in range(min(self.longest, len(words) - i), 0, -1):
+                name = self.skills.get(tuple(words[i:i + size]))
+                if name is not None:
+                    if size > 1 or name != word:
+                        terms.append(name)
+                    covered = i + size
+                    break
+        return terms
+
+
+@lru_cache(maxsize=4)
+def keyword_tokenizer(taxonomy):
+    return KeywordTokenizer(taxonomy)
+
+
+def tokenize(text, taxonomy=None):
+    """Returns the keyword terms of ``text`` (see KeywordTokenizer)."""
+    return keyword_tokenizer(taxonomy or load_taxonomy())(text)
+
+
+def resume_terms(spec, template=None, taxonomy=None):
+    """Keyword terms of a resume_spec.ResumeSpec as ``template`` lays it out.
+
+    Only what the template's rows write from KEYWORD_FIELDS and the skill lists counts, whatever
+    their styles: headings, constant rows, company names, dates and skill category labels are left out.
+    """
+    template = load_template(template)
+    taxonomy = taxonomy or load_taxonomy()
+    fields = spec.fields()
+    texts = []
+    for _, each, _, instructions in template.sections:
+        entries = [experience.fields(template.date_format, template.current_label)
+                   for experience in spec.experiences] if each else [fields]
+        for values in entries:
+            for kind, operand, _ in instructions:
+                if kind == SKILLS:
+                    texts += [', '.join(taxonomy.canonicalize(fields[category['id']]))
+                              for category in taxonomy.categories]
+                else:
+                    texts += [values[field] for field in instruction_fields(kind, operand) if field in KEYWORD_FIELDS]
+    return tokenize('\n'.join(texts), taxonomy)
+
+
+# Function to lay documents' term counts out as CSR arrays (indptr, term ids, counts), growing the vocabulary
+def term_matrix(documents, vocabulary):
+    lengths = np.fromiter((len(terms) for terms in documents), dtype=np.int64, count=len(documents))
+    term_ids = np.fromiter((vocabulary.setdefault(term, len(vocabulary)) for terms in documents for term in terms),
+                           dtype=np.int64, count=int(lengths.sum()))
+    # One sort counts every (document, term) pair and leaves them in CSR order
+    width = max(len(vocabulary), 1)
+    keys, counts = np.unique(np.repeat(np.arange(len(documents)), lengths) * width + term_ids, return_counts=True)
+    indptr = np.zeros(len(documents) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // width, minlength=len(documents)), out=indptr[1:])
+    return indptr, keys % width, counts.astype(np.float64)
+
+
+# Function to list the ranges of postings scored together, bounded by gathered entries and score cells
+def chunk_bounds(work, rows):
+    cumulative = np.cumsum(work)
+    max_postings = max(1, CHUNK_CELLS // max(rows, 1))
+    start = 0
+    while start < len(work):
+        base = cumulative[start - 1] if start else 0
+        end = int(np.searchsorted(cumulative, base + CHUNK_ENTRIES, side='right'))
+        end = min(max(end, start + 1), start + max_postings, len(work))
+        yield start, end
+        start = end
+
+
+class KeywordMatcher:
+    """Scores any number of resumes against a fixed set of job postings.
+
+    ``postings`` is a list of term lists (see tokenize). score returns a float32 matrix with
+    one row per resume and one column per posting.
+    """
+
+    def __init__(self, postings):
+        self.vocabulary = {}
+        self.indptr, self.term_ids, self.counts = term_matrix(postings, self.vocabulary)
+        self.terms = list(self.vocabulary)
+        self.posting_rows = np.repeat(np.arange(len(postings)), np.diff(self.indptr))
+        self.posting_df = np.bincount(self.term_ids, minlength=len(self.vocabulary))
+        # Smoothed IDF over the postings: flat for a single posting, lower for boilerplate shared by many
+        self.keyword_weights = np.log((1 + len(postings)) / (1 + self.posting_df)) + 1
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def score(self, resumes, method='bm25', k1=1.2, b=0.75):
+        if method not in ('bm25', 'tfidf', 'coverage'):
+            raise ValueError(f'unknown scoring method {method!r}')
+        vocabulary = dict(self.vocabulary)
+        indptr, term_ids, counts = term_matrix(resumes, vocabulary)
+        resume_count, posting_count, keyword_count = len(resumes), len(self), len(self.vocabulary)
+        rows = np.repeat(np.arange(resume_count), np.diff(indptr))
+        posting_weights = np.ones(len(self.term_ids))
+
+        if method == 'bm25':
+            df = np.bincount(term_ids, minlength=len(vocabulary))
+            idf = np.log(1 + (resume_count - df + 0.5) / (df + 0.5))
+            lengths = np.bincount(rows, counts, minlength=resume_count)
+            norm = k1 * (1 - b + b * lengths[rows] / max(lengths.mean() if resume_count else 1, 1))
+            weights = idf[term_ids] * counts * (k1 + 1) / (counts + norm)
+        elif method == 'tfidf':
+            df = np.bincount(term_ids, minlength=len(vocabulary))
+            df[:keyword_count] += self.posting_df
+            idf = np.log((1 + resume_count + posting_count) / (1 + df)) + 1
+            weights = (1 + np.log(counts)) * idf[term_ids]
+            weights /= np.sqrt(np.bincount(rows, weights * weights, minlength=resume_count))[rows]
+            posting_weights = (1 + np.log(self.counts)) * idf[self.term_ids]
+            posting_weights /= np.sqrt(np.bincount(self.posting_rows, posting_weights * posting_weights,
+                                                   minlength=posting_count))[self.posting_rows]
+        else:
+            weights = np.ones(len(term_ids))
+            posting_weights = self.keyword_weights[self.term_ids]
+            posting_weights /= np.bincount(self.posting_rows, posting_weights, minlength=posting_count)[
+                self.posting_rows]
+
+        # Terms no posting uses cannot score. Keywords found in many resumes are multiplied as dense
+        # blocks (a handful of terms carry most of the entries); the long tail is gathered sparsely.
+        keep = term_ids < keyword_count
+        resume_df = np.bincount(term_ids[keep], minlength=keyword_count)
+        dense = resume_df >= max(DENSE_MIN_RESUMES, DENSE_FRACTION * resume_count)
+        scores = np.zeros((posting_count, resume_count), dtype=np.float32)
+        if dense.any():
+            dense_entries = keep.copy()
+            dense_entries[keep] = dense[term_ids[keep]]
+            self._score_dense(scores, dense, rows[dense_entries], term_ids[dense_entries], weights[dense_entries],
+                              posting_weights)
+            keep &= ~dense_entries
+        self._score_sparse(scores, rows[keep], term_ids[keep], weights[keep], posting_weights)
+        return scores.T
+
+    def _score_dense(self, scores, dense, rows, term_ids, weights, posting_weights):
+        dense_index = np.cumsum(dense) - 1
+        posting_matrix = np.zeros((len(self), int(dense.sum())), dtype=np.float32)
+        entries = dense[self.term_ids]
+        posting_matrix[self.posting_rows[entries], dense_index[self.term_ids[entries]]] = posting_weights[entries]
+        block = max(1, CHUNK_CELLS // posting_matrix.shape[1])
+        resume_count = scores.shape[1]
+        bounds = np.searchsorted(rows, np.arange(0, resume_count + block, block))
+        for start, (first, last) in zip(range(0, resume_count, block), zip(bounds, bounds[1:])):
+            end = min(start + block, resume_count)
+            resume_matrix = np.zeros((end - start, posting_matrix.shape[1]), dtype=np.float32)
+            resume_matrix[rows[first:last] - start, dense_index[term_ids[first:last]]] = weights[first:last]
+            scores[:, start:end] += posting_matrix @ resume_matrix.T
+
+    def _score_sparse(self, scores, rows, term_ids, weights, posting_weights):
+        posting_count, resume_count = scores.shape
+        keyword_count = len(self.vocabulary)
+        # Resume weights as a column index: for each keyword, the resumes containing it
+        order = np.argsort(term_ids, kind='stable')
+        column_rows, column_weights = rows[order], weights[order]
+        column_ptr = np.zeros(keyword_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=keyword_count), out=column_ptr[1:])
+
+        entry_lengths = column_ptr[self.term_ids + 1] - column_ptr[self.term_ids]
+        work = np.bincount(self.posting_rows, entry_lengths, minlength=posting_count)
+        for start, end in chunk_bounds(work, resume_count):
+            entries = slice(self.indptr[start], self.indptr[end])
+            lengths = entry_lengths[entries]
+            total = int(lengths.sum())
+            if not total:
+                continue
+            # Gather every resume entry of every keyword of these postings in one ragged range
+            starts = column_ptr[self.term_ids[entries]]
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+            owners = np.repeat(self.posting_rows[entries] - start, lengths)
+            values = column_weights[positions] * np.repeat(posting_weights[entries], lengths)
+            cells = np.bincount(owners * resume_count + column_rows[positions], values,
+                                minlength=(end - start) * resume_count)
+            scores[start:end] += cells.reshape(end - start, resume_count)
+
+    def missing(self, terms, posting_index, limit=10, taxonomy=None):
+        """Returns the posting's keywords absent from ``terms``, taxonomy skills first, then by weight."""
+        present = set(terms)
+        skill_terms = keyword_tokenizer(taxonomy or load_taxonomy()).skill_terms
+        entries = slice(self.indptr[posting_index], self.indptr[posting_index + 1])
+        missing = [(self.terms[term_id] not in skill_terms, -self.keyword_weights[term_id] * count, self.terms[term_id])
+                   for term_id, count in zip(self.term_ids[entries].tolist(), self.counts[entries].tolist())
+                   if self.terms[term_id] not in present]
+        return [term for _, _, term in sorted(missing)[:limit]]
+
+
+# Function to yield (label, ResumeSpec) from bulk records or .docx resumes
+def iter_resume_specs(path):
+    from bulk_generate import iter_records, parse_record, resume_filename
+    from resume_importer import import_resume, iter_sources
+    if path.lower().endswith(('.jsonl', '.csv')):
+        for row_number, record in iter_records(path):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                label = os.path.splitext(resume_filename(row_number, record))[0]
+                yield label, parse_record(record)
+            except (ValueError, TypeError) as exc:
+                print(f'row {row_number}: {exc}', file=sys.stderr)
+        return
+    for label, source in iter_sources(path):
+        try:
+            yield label, parse_record(import_resume(source))
+        except (ValueError, TypeError) as exc:
+            print(f'{label}: {exc}', file=sys.stderr)
+
+
+# Function to yield (id, text) postings from .txt files or a JSONL file
+def iter_postings(path):
+    if path.lower().endswith('.jsonl'):
+        with open(path, encoding='utf-8') as file:
+            for line_number, line in enumerate(file, 1):
+                if line.strip():
+                    posting = json.loads(line)
+                    yield str(posting.get('id', line_number)), posting.get('text', '')
+        return
+    paths = [path] if os.path.isfile(path) else sorted(
+        os.path.join(directory, filename) for directory, _, filenames in os.walk(path)
+        for filename in filenames if filename.lower().endswith('.txt'))
+    for posting_path in paths:
+        with open(posting_path, encoding='utf-8') as file:
+            yield os.path.relpath(posting_path, path) if posting_path != path else os.path.basename(path), file.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score resumes against job postings by ATS keyword match.')
+    parser.add_argument('--resumes', required=True, help='bulk records (.jsonl/.csv) or .docx file, directory or ZIP')
+    parser.add_argument('--postings', required=True, help='.txt file or directory, or .jsonl of {"id", "text"}')
+    parser.add_argument('--method', choices=['bm25', 'tfidf', 'coverage'], default='bm25')
+    parser.add_argument('--by', choices=['resume', 'posting'], default='resume',
+                        help='list the best postings for each resume, or the best resumes for each posting')
+    parser.add_argument('--top', type=int, default=5, help='matches listed per line')
+    parser.add_argument('--missing', type=int, default=10, help='missing keywords listed per match')
+    parser.add_argument('--output', '-o', help='JSONL file to write (default: stdout)')
+    parser.add_argument('--template', help='resume_template the resumes are laid out with (name or path)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    posting_ids, resume_labels, resumes = [], [], []
+    postings = []
+    for posting_id, text in iter_postings(args.postings):
+        posting_ids.append(posting_id)
+        postings.append(tokenize(text))
+    for label, spec in iter_resume_specs(args.resumes):
+        resume_labels.append(label)
+        resumes.append(resume_terms(spec, args.template))
+    tokenized = time.perf_counter()
+    matcher = KeywordMatcher(postings)
+    scores = matcher.score(resumes, args.method)
+    coverage = scores if args.method == 'coverage' else matcher.score(resumes, 'coverage')
+    scored = time.perf_counter()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        by_resume = args.by == 'resume'
+        matrix = scores if by_resume else scores.T
+        labels, other_labels = (resume_labels, posting_ids) if by_resume else (posting_ids, resume_labels)
+        for index, row in enumerate(matrix):
+            best = np.argsort(-row, kind='stable')[:args.top]
+            matches = []
+            for other in best:
+                resume_index, posting_index = (index, other) if by_resume else (other, index)
+                matches.append({'resume' if not by_resume else 'posting': other_labels[other],
+                                'score': round(float(row[other]), 4),
+                                'coverage': round(float(coverage[resume_index, posting_index]), 4),
+                                'missing': matcher.missing(resumes[resume_index], posting_index, args.missing)})
+            line = {'resume' if by_resume else 'posting': labels[index], 'matches': matches}
+            output.write(json.dumps(line, ensure_ascii=False) + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f'{len(resumes)} resumes x {len(postings)} postings: tokenized in {tokenized - started:.1f}s, '
+          f'scored in {scored - tokenized:.2f}s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Benchmarks generate_resume across input scales.
+
+Each case renders a synthetic candidate and records the median wall time of every stage
+(laying out rows, building the python-docx table, saving the package), the tracemalloc peak
+of one extra render and the output size. Results are written as JSON so two commits can be
+compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+
+``--template`` renders with another resume_template layout than the default.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+from importlib import metadata
+
+import resume_generator
+from resume_spec import SKILL_FIELDS
+
+WORDS = ('built automated reporting pipelines dashboards for stakeholders using python sql power bi '
+         'reduced manual effort improved data quality across regional sales finance teams').split()
+
+# Baseline candidate; each sweep varies one dimension around it
+BASELINE = {'experiences': 5, 'jd_lines': 5, 'skills': 5}
+SWEEPS = {'experiences': [1, 10, 50, 100, 250, 500], 'jd_lines': [1, 10, 50, 200], 'skills': [0, 10, 50]}
+
+
+# Function to build a sentence of synthetic job-description text
+def sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def synthetic_candidate(experiences=5, jd_lines=5, skills=5, seed=0):
+    """Returns generate_resume positional arguments for a reproducible synthetic candidate."""
+    rng = random.Random(seed)
+    skill_lists = {field: [f'{field.replace("_", " ").title()} {i}' for i in range(skills)] for field in SKILL_FIELDS}
+    details = []
+    for i in range(experiences):
+        start = date(2000 + i % 20, 1 + i % 12, 1)
+        details.append((f'Data Analyst {i}', f'Company {i}', start, date(start.year + 1, start.month, 1), i == 0,
+                        '\n'.join(sentence(rng) for _ in range(jd_lines))))
+    return ['Jane Doe', 'Pune', 'Baner', '411045', 'jane@example.com', '+91 98765 43210',
+            'linkedin.com/in/janedoe', sentence(rng, 40),
+            skill_lists['programming_languages'], skill_lists['libraries'], skill_lists['business_intelligence'],
+            skill_lists['data_engineering'], skill_lists['big_data'],
+            'B.Sc Statistics', 'University of Pune', '\n'.join(sentence(rng, 5) for _ in range(3)),
+            '\n'.join(sentence(rng, 4) for _ in range(3)), skill_lists['statistical_methods'],
+            skill_lists['data_collection'], skill_lists['database_management'], skill_lists['cloud_platforms'],
+            skill_lists['machine_learning'], *details]
+
+
+# Function to time each stage of one uncached render, in milliseconds
+def time_stages(args, backend, template=None):
+    started = time.perf_counter()
+    rows = resume_generator.resume_rows(*args, template=template)
+    laid_out = time.perf_counter()
+    if backend == 'pdf':
+        resume_bytes = resume_generator.render_resume(rows, None, file_format='pdf', template=template)
+        built = saved = time.perf_counter()
+    elif backend == 'ooxml':
+        resume_bytes = resume_generator.render_resume(rows, None, backend, template=template)
+        built = saved = time.perf_counter()
+    else:
+        doc = resume_generator.render_docx(rows, styles=resume_generator.load_template(template).styles)
+        built = time.perf_counter()
+        resume_bytes = resume_generator.save_document(doc)
+        saved = time.perf_counter()
+    stages = {'layout_ms': (laid_out - started) * 1000, 'rows_ms': (built - laid_out) * 1000,
+              'save_ms': (saved - built) * 1000, 'total_ms': (saved - started) * 1000}
+    return stages, len(resume_bytes)
+
+
+def run_case(case, backend='docx', repeats=5, template=None):
+    """Benchmarks one case and returns its result record."""
+    args = synthetic_candidate(**case)
+    time_stages(args, backend, template)  # warm the template, prototype and fragment caches
+    samples = []
+    for _ in range(repeats):
+        stages, size = time_stages(args, backend, template)
+        samples.append(stages)
+    tracemalloc.start()
+    time_stages(args, backend, template)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result = dict(case, backend=backend, repeats=repeats, output_bytes=size, peak_bytes=peak)
+    if template:
+        result['template'] = template
+    for stage in samples[0]:
+        result[stage] = round(statistics.median(sample[stage] for sample in samples), 3)
+    return result
+
+
+# Function to list the benchmark cases, either one-at-a-time sweeps or the full grid
+def benchmark_cases(grid=False):
+    if grid:
+        return [{'experiences': e, 'jd_lines': j, 'skills': s}
+                for e in SWEEPS['experiences'] for j in SWEEPS['jd_lines'] for s in SWEEPS['skills']]
+    cases = []
+    for dimension, values in SWEEPS.items():
+        for value in values:
+            case = dict(BASELINE, **{dimension: value})
+            if case not in cases:
+                cases.append(case)
+    return cases
+
+
+# Function to record where the numbers came from
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'python_docx': metadata.version('python-docx')}
+
+
+# Function to print the per-case change against an earlier results file
+def compare(results, baseline):
+    key = lambda result: (result['experiences'], result['jd_lines'], result['skills'], result['backend'],
+                          result.get('template'))
+    previous = {key(result): result for result in baseline['cases']}
+    print(f"{'case':<28}{'total ms':>12}{'before':>10}{'change':>9}{'peak KiB':>10}{'before':>9}")
+    for result in results['cases']:
+        old = previous.get(key(result))
+        label = f"exp={result['experiences']} jd={result['jd_lines']} skills={result['skills']}"
+        if old is None:
+            print(f"{label:<28}{result['total_ms']:>12.1f}{'-':>10}")
+            continue
+        change = (result['total_ms'] / old['total_ms'] - 1) * 100 if old['total_ms'] else 0
+        print(f"{label:<28}{result['total_ms']:>12.1f}{old['total_ms']:>10.1f}{change:>+8.1f}%"
+              f"{result['peak_bytes'] / 1024:>10.0f}{old['peak_bytes'] / 1024:>9.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark generate_resume across input scales.')
+    parser.add_argument('--output', default='benchmark.json', help='where to write the JSON results')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    parser.add_argument('--backend', choices=['docx', 'ooxml', 'pdf'], default='docx')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--grid', action='store_true', help='run every combination instead of one-at-a-time sweeps')
+    parser.add_argument('--template', default=None, help='resume template name or file (default: data_analyst)')
+    args = parser.parse_args(argv)
+
+    results = {'environment': environment(), 'cases': []}
+    for case in benchmark_cases(args.grid):
+        result = run_case(case, args.backend, args.repeats, args.template)
+        results['cases'].append(result)
+        print(f"exp={case['experiences']:<4} jd={case['jd_lines']:<4} skills={case['skills']:<3} "
+              f"total={result['total_ms']:9.1f} ms  rows={result['rows_ms']:8.1f} ms  save={result['save_ms']:7.1f} ms  "
+              f"peak={result['peak_bytes'] / 1024:7.0f} KiB  size={result['output_bytes']}", file=sys.stderr)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
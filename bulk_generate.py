@@ -0,0 +1,221 @@
+"""Bulk resume generation for whole cohorts.
+
+Reads candidates from a JSONL or CSV file one record at a time, renders them across a pool of
+worker processes and streams the results into a single ZIP or into one .docx per candidate.
+
+    python bulk_generate.py cohort.jsonl --zip resumes.zip --workers 4
+
+Each record holds generate_resume's parameters by name. Skill lists are JSON arrays (or
+';'-separated strings in CSV), and ``experience_details`` is a list of objects with ``profile``,
+``company_name``, ``start_date``, ``end_date`` (ISO dates; only a current job may omit its
+end), ``is_current_job`` and ``jd`` (a JSON string column in CSV). ``--template`` picks the resume layout (see resume_template).
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import resume_generator
+from resume_spec import RESUME_FIELDS, SKILL_FIELDS, ResumeSpec, to_spec
+
+LIST_FIELDS = set(SKILL_FIELDS)
+EXPERIENCE_FIELDS = ['profile', 'company_name', 'start_date', 'end_date', 'is_current_job', 'jd']
+
+
+# Function to yield (row number, record or error) from a JSONL or CSV file without loading it whole
+def iter_records(path, file_format=None):
+    file_format = file_format or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    with open(path, newline='' if file_format == 'csv' else None, encoding='utf-8') as file:
+        if file_format == 'csv':
+            for row_number, record in enumerate(csv.DictReader(file), 1):
+                yield row_number, record
+            return
+        for row_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield row_number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield row_number, ValueError(f'invalid JSON: {exc}')
+
+
+# Function to read a yes/no flag from JSON or CSV
+def parse_flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+# Function to read a skill list given as a JSON array or a ';'-separated string
+def parse_list(value, field):
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        if value.lstrip().startswith('['):
+            value = json.loads(value)
+        else:
+            return [item.strip() for item in value.split(';') if item.strip()]
+    if not isinstance(value, list):
+        raise ValueError(f'{field} must be a list')
+    return [str(item) for item in value]
+
+
+# Function to turn one experience object (or 6-item list) into generate_resume's tuple
+def parse_experience(experience, index):
+    if isinstance(experience, (list, tuple)):
+        experience = dict(zip(EXPERIENCE_FIELDS, experience))
+    if not isinstance(experience, dict):
+        raise ValueError(f'experience {index} must be an object')
+    # ResumeSpec reads the ISO dates and checks the required fields and date order
+    return (experience.get('profile'), experience.get('company_name'), experience.get('start_date'),
+            experience.get('end_date'), parse_flag(experience.get('is_current_job', False)), experience.get('jd'))
+
+
+def parse_record(record):
+    """Turns one input record into a resume_spec.ResumeSpec, raising ValueError if it is bad."""
+    if not isinstance(record, dict):
+        raise ValueError('record must be an object')
+    args = []
+    for field in RESUME_FIELDS:
+        value = record.get(field)
+        if field in LIST_FIELDS:
+            args.append(parse_list(value, field))
+        else:
+            args.append('' if value is None else str(value))
+    experiences = record.get('experience_details') or []
+    if isinstance(experiences, str):
+        experiences = json.loads(experiences)
+    if not isinstance(experiences, list):
+        raise ValueError('experience_details must be a list')
+    args.extend(parse_experience(experience, index) for index, experience in enumerate(experiences, 1))
+    return ResumeSpec.from_args(*args)
+
+
+def record_from_args(*inputs):
+    """Inverse of parse_record: turns a ResumeSpec (or generate_resume's positional arguments) into a record."""
+    return to_spec(inputs).to_record()
+
+
+# Function to build a safe, unique file name for a candidate's resume
+def resume_filename(row_number, record):
+    stem = re.sub(r'[^A-Za-z0-9]+', '_', str(record.get('name', ''))).strip('_') or 'resume'
+    return f'{row_number:06d}_{stem}.docx'
+
+
+# Runs once in each worker so python-docx, the template and its document prototype are loaded before the first render
+def warm_worker(template=None):
+    resume_generator.build_prototype(resume_generator.load_template(template).styles)
+
+
+# Function run in the workers: render one candidate's ResumeSpec to bytes
+def render_candidate(spec, backend, compresslevel=None, template=None):
+    return resume_generator.generate_resume(spec, backend=backend, cache=None, compresslevel=compresslevel,
+                                            template=template)
+
+
+# Writes rendered resumes either into one ZIP or as loose files in a directory
+class ResumeSink:
+    def __init__(self, zip_path=None, out_dir=None, compress=False):
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self.zip = zipfile.ZipFile(zip_path, 'w', compression=compression) if zip_path else None
+        self.out_dir = out_dir
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, filename, resume_bytes):
+        if self.zip is not None:
+            # A deflated .docx is stored as-is; store-only ones are compressed once, here
+            self.zip.writestr(filename, resume_bytes)
+        else:
+            with open(os.path.join(self.out_dir, filename), 'wb') as file:
+                file.write(resume_bytes)
+
+    def close(self):
+        if self.zip is not None:
+            self.zip.close()
+
+
+def generate_bulk(records, sink, workers=None, backend='docx', max_pending=None, report=None, compresslevel=None,
+                  template=None):
+    """Renders (row number, record) pairs into ``sink`` and returns (rendered, failed) counts.
+
+    At most ``max_pending`` records are in flight at once, so memory stays bounded however
+    large the input is. Bad records are reported and skipped instead of aborting the batch.
+    """
+    report = report or (lambda row_number, message: print(f'row {row_number}: {message}', file=sys.stderr))
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    rendered = failed = 0
+    pending = {}
+
+    def collect(done):
+        nonlocal rendered, failed
+        for future in done:
+            row_number, filename = pending.pop(future)
+            try:
+                sink.write(filename, future.result())
+                rendered += 1
+            except Exception as exc:
+                failed += 1
+                report(row_number, f'render failed: {exc}')
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_worker, initargs=(template,)) as pool:
+        for row_number, record in records:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                spec = parse_record(record)
+            except (ValueError, TypeError) as exc:
+                failed += 1
+                report(row_number, str(exc))
+                continue
+            future = pool.submit(render_candidate, spec, backend, compresslevel, template)
+            pending[future] = (row_number, resume_filename(row_number, record))
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    return rendered, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate resumes in bulk from a JSONL or CSV file.')
+    parser.add_argument('input', help='candidates file (.jsonl or .csv)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='input format (default: from the file extension)')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--zip', help='write every resume into this ZIP file')
+    target.add_argument('--out-dir', help='write one .docx per candidate into this directory')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--backend', choices=['docx', 'ooxml'], default='docx', help='rendering backend')
+    parser.add_argument('--compresslevel', type=int, choices=range(10), default=None, metavar='0-9',
+                        help='deflate level of each .docx (0 stores it uncompressed)')
+    parser.add_argument('--template', default=None,
+                        help='resume template name or file (default: RESUME_TEMPLATE or data_analyst)')
+    args = parser.parse_args(argv)
+    try:
+        resume_generator.load_template(args.template)  # fail on a bad template before starting the pool
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    started = time.perf_counter()
+    sink = ResumeSink(zip_path=args.zip, out_dir=args.out_dir, compress=args.compresslevel == 0)
+    try:
+        rendered, failed = generate_bulk(iter_records(args.input, args.format), sink,
+                                         workers=args.workers, backend=args.backend,
+                                         compresslevel=args.compresslevel, template=args.template)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - started
+    print(f'{rendered} resumes rendered, {failed} failed in {elapsed:.1f}s', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
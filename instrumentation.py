@@ -0,0 +1,109 @@
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger('resume_generator.stages')
+
+# Shared do-nothing span for uninstrumented renders, so the default path allocates nothing
+NO_SPAN = nullcontext()
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def span(instrument, stage):
+    """Returns a context manager timing ``stage`` on ``instrument``, or a no-op when it is None."""
+    return NO_SPAN if instrument is None else instrument.span(stage)
+
+
+# Default sink: one log line per stage
+def log_span(stage, seconds, allocated_blocks):
+    logger.info('%s took %.2f ms (%+d allocated blocks)', stage, seconds * 1000, allocated_blocks)
+
+
+class Instrumentation:
+    """Times named stages of a render and forwards each span to the sinks.
+
+    A sink is any callable taking ``(stage, seconds, allocated_blocks)``, where allocated_blocks
+    is the net change in ``sys.getallocatedblocks()`` over the stage.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = sinks or (log_span,)
+
+    @contextmanager
+    def span(self, stage):
+        blocks = sys.getallocatedblocks()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            allocated_blocks = sys.getallocatedblocks() - blocks
+            for sink in self.sinks:
+                sink(stage, seconds, allocated_blocks)
+
+
+class PrometheusExporter:
+    """Sink aggregating stage spans into Prometheus text-format metrics."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stage, seconds, allocated_blocks):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {'count': 0, 'seconds': 0.0, 'blocks': 0,
+                                               'buckets': [0] * len(self.buckets)}
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['blocks'] += allocated_blocks
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats['buckets'][index] += 1
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        with self._lock:
+            stages = {stage: dict(stats, buckets=list(stats['buckets'])) for stage, stats in self._stages.items()}
+        lines = ['# HELP resume_stage_duration_seconds Time spent in each resume render stage.',
+                 '# TYPE resume_stage_duration_seconds histogram']
+        for stage, stats in sorted(stages.items()):
+            for bound, count in zip(self.buckets, stats['buckets']):
+                lines.append(f'resume_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'resume_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'resume_stage_duration_seconds_sum{{stage="{stage}"}} {stats["seconds"]}')
+            lines.append(f'resume_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += ['# HELP resume_stage_allocated_blocks Net allocated memory blocks summed over each stage.',
+                  '# TYPE resume_stage_allocated_blocks gauge']
+        for stage, stats in sorted(stages.items()):
+            lines.append(f'resume_stage_allocated_blocks{{stage="{stage}"}} {stats["blocks"]}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        """Serves ``/metrics`` from a background thread and returns the running server."""
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
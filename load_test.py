@@ -0,0 +1,333 @@
+"""Load test for the Streamlit app: N concurrent sessions served by one `streamlit run` process.
+
+Starts the app headless on a free port (or targets a running one with ``--url``) and drives each
+session over Streamlit's websocket protocol the way a browser does. Every session fills the form
+with its own candidate, including a varied Experience Count, submits it, then downloads the
+.docx and PDF from the server's media endpoint. For each concurrency level it reports:
+
+- p50/p95/p99 submit-to-download latency and completed submits per second;
+- server memory growth per session (RSS, Linux only, when this tool started the server);
+- isolation failures: a download that is not the submitting session's own resume.
+
+    python load_test.py --sessions 1 5 10 20 --iterations 3 --output load.json
+
+Sessions run as asyncio tasks in this process. On a small machine the clients compete with the
+server for CPU, so compare levels against each other rather than reading absolute numbers.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import zipfile
+from datetime import date
+from io import BytesIO
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import AsyncHTTPClient
+from tornado.websocket import websocket_connect
+
+from benchmark import environment, sentence
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume_generator.py')
+TOKEN = re.compile(rb'LT\d{5}X\d{3}')
+
+
+class AppSession:
+    """One browser session: a websocket to the app and the widgets its last script run drew.
+
+    ``widgets`` maps each widget's key (or its label, for widgets without a key) to its element
+    type and proto, which is all a client needs to send values back.
+    """
+
+    def __init__(self, base_url, timeout=60.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.http = AsyncHTTPClient()
+        self.ws = None
+        self.widgets = {}
+        self.errors = []
+
+    async def connect(self):
+        self.ws = await websocket_connect(re.sub('^http', 'ws', self.base_url) + '/_stcore/stream',
+                                          subprotocols=['streamlit'])
+        await self.rerun([])
+
+    async def rerun(self, widget_states):
+        """Runs the script with ``widget_states`` and waits for it to finish."""
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.widget_states.widgets.extend(widget_states)
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+        self.widgets = {}
+        self.errors = []
+        while True:
+            forward = await self.receive()
+            kind = forward.WhichOneof('type')
+            if kind == 'script_finished':
+                return
+            if kind != 'delta' or forward.delta.WhichOneof('type') != 'new_element':
+                continue
+            element = forward.delta.new_element
+            element_type = element.WhichOneof('type')
+            proto = getattr(element, element_type)
+            if element_type == 'exception':
+                self.errors.append(proto.message)
+            widget_id = getattr(proto, 'id', '')
+            if widget_id.startswith('$$WIDGET_ID-'):
+                key = widget_id.split('-', 2)[2]
+                self.widgets[proto.label if key == 'None' else key] = (element_type, proto)
+
+    async def receive(self):
+        raw = await asyncio.wait_for(self.ws.read_message(), self.timeout)
+        if raw is None:
+            raise ConnectionError('the app closed the websocket')
+        forward = ForwardMsg()
+        forward.ParseFromString(raw)
+        if forward.WhichOneof('type') == 'ref_hash':
+            # Large messages the session already received are sent by reference and fetched over HTTP
+            response = await self.http.fetch(f'{self.base_url}/_stcore/message?hash={forward.ref_hash}')
+            forward = ForwardMsg()
+            forward.ParseFromString(response.body)
+        return forward
+
+    async def download(self, label):
+        """Fetches a download button's payload, or returns None when the button isn't shown."""
+        widget = self.widgets.get(label)
+        if widget is None:
+            return None
+        response = await self.http.fetch(self.base_url + widget[1].url, request_timeout=self.timeout)
+        return response.body
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+# Function to encode a Python value as the widget state the browser would send
+def widget_state(element_type, proto, value):
+    state = WidgetState(id=proto.id)
+    if element_type in ('text_input', 'text_area'):
+        state.string_value = value
+    elif element_type == 'multiselect':
+        options = list(proto.options)
+        state.int_array_value.data.extend(options.index(option) for option in value)
+    elif element_type == 'selectbox':
+        state.int_value = list(proto.options).index(value)
+    elif element_type == 'number_input':
+        if proto.data_type == NumberInput.INT:
+            state.int_value = value
+        else:
+            state.double_value = value
+    elif element_type == 'date_input':
+        state.string_array_value.data.append(value.strftime('%Y/%m/%d'))
+    elif element_type == 'checkbox':
+        state.bool_value = value
+    elif element_type == 'button':
+        state.trigger_value = value
+    else:
+        raise ValueError(f'cannot fill a {element_type} widget')
+    return state
+
+
+# Function to make up a candidate for the widgets on screen; the token ends up in the resume's name
+def form_values(rng, token, experiences, widgets):
+    values = {'name': f'{token} Candidate', 'city': 'Pune', 'area_name': 'Baner', 'zipcode': '411045',
+              'email': f'{token.lower()}@example.com', 'phone': '+91 98765 43210',
+              'linkedin': f'linkedin.com/in/{token.lower()}', 'summary': sentence(rng, 40),
+              'degree': 'B.Sc Statistics', 'university': 'University of Pune',
+              'certifications': '\n'.join(sentence(rng, 5) for _ in range(3)),
+              'additional_skills': '\n'.join(sentence(rng, 4) for _ in range(3)),
+              'experience_count': experiences}
+    for key, (element_type, proto) in widgets.items():
+        if element_type == 'multiselect':
+            values[key] = rng.sample(list(proto.options), min(len(proto.options), rng.randint(0, 4)))
+        elif element_type == 'selectbox' and key == 'template':
+            values[key] = rng.choice(list(proto.options))
+        elif element_type == 'button' and proto.is_form_submitter:
+            values[key] = True
+    for i in range(1, experiences + 1):
+        start = date(2010 + i % 12, 1 + rng.randrange(12), 1)
+        values.update({f'profile_{i}': f'Data Analyst {i}', f'company_{i}': f'Company {i}',
+                       f'start_date_{i}': start, f'end_date_{i}': date(start.year + 1, start.month, 1),
+                       f'current_{i}': i == 1, f'jd_{i}': '\n'.join(sentence(rng) for _ in range(4))})
+    # Experience fields only exist once a submit with the new count has drawn them
+    return [widget_state(*widgets[key], value) for key, value in values.items() if key in widgets]
+
+
+# Function to find the load-test tokens in a .docx; a session's own resume holds exactly its token
+def resume_tokens(resume_bytes):
+    with zipfile.ZipFile(BytesIO(resume_bytes)) as package:
+        return set(TOKEN.findall(package.read('word/document.xml')))
+
+
+async def run_session(base_url, index, iterations, max_experiences, seed=0, timeout=60.0):
+    """Drives one session through ``iterations`` submits; returns (session, per-submit records)."""
+    rng = random.Random(seed * 1000003 + index)
+    session = AppSession(base_url, timeout)
+    await session.connect()
+    experiences = rng.randint(0, max_experiences)
+    records = []
+    for iteration in range(iterations):
+        token = f'LT{index:05d}X{iteration:03d}'
+        states = form_values(rng, token, experiences, session.widgets)
+        record = {'session': index, 'iteration': iteration, 'experiences': experiences, 'error': None}
+        started = time.perf_counter()
+        try:
+            await session.rerun(states)
+            resume_bytes = await session.download('Download Resume')
+            pdf_bytes = await session.download('Download PDF')
+            record['latency_ms'] = (time.perf_counter() - started) * 1000
+            if session.errors:
+                record['error'] = session.errors[0]
+            elif resume_bytes is None:
+                record['error'] = 'no resume download after submit'
+            else:
+                tokens = resume_tokens(resume_bytes)
+                record['isolated'] = tokens == {token.encode()}
+                record['pdf'] = pdf_bytes is not None and pdf_bytes.startswith(b'%PDF')
+        except Exception as exc:
+            record['error'] = f'{type(exc).__name__}: {exc}'
+        records.append(record)
+    return session, records
+
+
+# Function to pick the value below which ``percent`` of the samples fall (nearest rank)
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)] if ordered else None
+
+
+# Function to read a process's resident set size in bytes (Linux); None where /proc isn't available
+def rss_bytes(pid):
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+async def run_level(base_url, sessions, first_index, args, pid=None):
+    """Runs ``sessions`` concurrent sessions and summarizes their submits."""
+    rss_before = rss_bytes(pid) if pid else None
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_session(base_url, first_index + index, args.iterations,
+                                                 args.max_experiences, args.seed, args.timeout)
+                                     for index in range(sessions)))
+    elapsed = time.perf_counter() - started
+    # Measured while every session is still connected and holding its state
+    rss_after = rss_bytes(pid) if pid else None
+    for session, _ in results:
+        session.close()
+    records = [record for _, session_records in results for record in session_records]
+    latencies = [record['latency_ms'] for record in records if record['error'] is None]
+    summary = {'sessions': sessions, 'submits': len(records), 'completed': len(latencies),
+               'errors': sum(record['error'] is not None for record in records),
+               'isolation_failures': sum(record.get('isolated') is False for record in records),
+               'pdf_failures': sum(record.get('pdf') is False for record in records),
+               'p50_ms': percentile(latencies, 50), 'p95_ms': percentile(latencies, 95),
+               'p99_ms': percentile(latencies, 99), 'throughput_per_s': len(latencies) / elapsed,
+               'elapsed_s': elapsed,
+               'rss_growth_per_session_bytes': ((rss_after - rss_before) / sessions
+                                                if rss_before is not None and rss_after is not None else None),
+               'first_errors': sorted({record['error'] for record in records if record['error']})[:5]}
+    return summary
+
+
+# Function to find a free local TCP port
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port=None, startup_timeout=60.0):
+    """Starts the app headless with `streamlit run` and waits until it is healthy; returns (process, URL)."""
+    port = port or free_port()
+    command = [sys.executable, '-m', 'streamlit', 'run', APP, '--server.headless', 'true',
+               '--server.port', str(port), '--server.address', '127.0.0.1',
+               '--browser.gatherUsageStats', 'false', '--server.fileWatcherType', 'none']
+    process = subprocess.Popen(command, cwd=os.path.dirname(APP), stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'streamlit exited with status {process.returncode}')
+        try:
+            with urllib.request.urlopen(base_url + '/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'streamlit did not become healthy within {startup_timeout:.0f}s')
+
+
+async def load_test(base_url, args, pid=None):
+    """Warms the app with one session, then runs every concurrency level; returns the results record."""
+    _, warmup = await run_session(base_url, 0, 1, args.max_experiences, args.seed, args.timeout)
+    results = {'environment': environment(), 'base_url': base_url, 'iterations': args.iterations,
+               'max_experiences': args.max_experiences, 'warmup': warmup[0], 'levels': []}
+    first_index = 1
+    for sessions in args.sessions:
+        summary = await run_level(base_url, sessions, first_index, args, pid)
+        first_index += sessions
+        results['levels'].append(summary)
+        growth = summary['rss_growth_per_session_bytes']
+        print(f"sessions={sessions:<4} submits={summary['completed']}/{summary['submits']:<5} "
+              f"p50={summary['p50_ms'] or 0:8.1f} ms  p95={summary['p95_ms'] or 0:8.1f} ms  "
+              f"p99={summary['p99_ms'] or 0:8.1f} ms  {summary['throughput_per_s']:6.2f} submits/s  "
+              f"rss/session={'-' if growth is None else f'{growth / 1024:.0f} KiB':>9}  "
+              f"errors={summary['errors']} isolation_failures={summary['isolation_failures']}", file=sys.stderr)
+        for error in summary['first_errors']:
+            print(f'    {error}', file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the Streamlit app with concurrent sessions.')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10],
+                        help='concurrency levels to run, one after the other')
+    parser.add_argument('--iterations', type=int, default=3, help='submits per session')
+    parser.add_argument('--max-experiences', type=int, default=5,
+                        help='each session picks an Experience Count between 0 and this')
+    parser.add_argument('--url', help='test an already running app instead of starting one')
+    parser.add_argument('--port', type=int, help='port for the started app (default: a free one)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='seconds to wait for one script run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON results here')
+    args = parser.parse_args(argv)
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process, base_url = start_server(args.port)
+    try:
+        results = asyncio.run(load_test(base_url, args, process.pid if process else None))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    failed = any(level['errors'] or level['isolation_failures'] for level in results['levels'])
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
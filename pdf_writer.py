@@ -0,0 +1,528 @@
+"""Pure-Python PDF output for the resume layout.
+
+Takes the same (text, formatting) rows generate_resume lays out and writes a Letter-size PDF
+with 10 mm margins: a centered header, section headings with bottom rules and wrapped bullet
+blocks. Text is set in an embedded TrueType font (Type0/Identity-H with a ToUnicode map), so
+it stays selectable and ATS parsers can extract it.
+
+The font comes from ``RESUME_PDF_FONT`` / ``RESUME_PDF_BOLD_FONT`` or, failing that, the first
+Arial-compatible font found in the usual system font directories. Without a bold face the
+regular one is stroked to look bold. Without a usable font, write_pdf raises PdfFontError.
+"""
+import os
+import struct
+import zlib
+from functools import lru_cache
+from io import BytesIO
+
+PAGE_WIDTH, PAGE_HEIGHT = 612.0, 792.0  # Letter, the page size of the DOCX template
+MARGIN = 10 * 72 / 25.4  # 10 mm
+CELL_PADDING = 5.4  # Word's default left/right table cell margin
+SPACE_AFTER = 10.0
+LINE_SPACING = 1.15
+HEADING_HEIGHT = 10 * 72 / 25.4  # heading rows are exactly 10 mm high
+RULE_WIDTH = 0.5
+ACCENT = (0, 102, 204)
+
+FONT_FILES = {
+    'regular': ['LiberationSans-Regular.ttf', 'Arial.ttf', 'arial.ttf', 'DejaVuSans.ttf', 'Lato-Regular.ttf'],
+    'bold': ['LiberationSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf', 'DejaVuSans-Bold.ttf', 'Lato-Bold.ttf'],
+}
+FONT_DIRS = ['/usr/share/fonts', '/usr/local/share/fonts', '~/.local/share/fonts', '~/.fonts', '/Library/Fonts',
+             '/System/Library/Fonts/Supplemental', 'C:/Windows/Fonts']
+
+
+class PdfFontError(Exception):
+    """No font the writer can embed: none found, or the configured file is not a usable TrueType font."""
+
+
+class TrueTypeFont:
+    """The metrics and character map of a TrueType font, read straight from its tables."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.data = data = file.read()
+        if data[:4] not in (b'\x00\x01\x00\x00', b'true'):
+            raise ValueError(f'{path} is not a single TrueType font (collections and CFF fonts are not supported)')
+        self.tables = tables = {}
+        self.table_lengths = {}
+        for index in range(struct.unpack('>H', data[4:6])[0]):
+            tag, _, offset, length = struct.unpack('>4sIII', data[12 + 16 * index:28 + 16 * index])
+            tables[tag.decode('latin-1')] = offset
+            self.table_lengths[tag.decode('latin-1')] = length
+        head, hhea = tables['head'], tables['hhea']
+        self.units_per_em = struct.unpack('>H', data[head + 18:head + 20])[0]
+        self.bbox = struct.unpack('>4h', data[head + 36:head + 44])
+        self.ascent, self.descent, self.line_gap = struct.unpack('>3h', data[hhea + 4:hhea + 10])
+        metric_count = struct.unpack('>H', data[hhea + 34:hhea + 36])[0]
+        glyph_count = struct.unpack('>H', data[tables['maxp'] + 4:tables['maxp'] + 6])[0]
+        advances = [struct.unpack('>H', data[tables['hmtx'] + 4 * i:tables['hmtx'] + 4 * i + 2])[0]
+                    for i in range(metric_count)]
+        self.advances = advances + [advances[-1]] * max(0, glyph_count - metric_count)
+        self.italic_angle = struct.unpack('>i', data[tables['post'] + 4:tables['post'] + 8])[0] / 65536 \
+            if 'post' in tables else 0
+        self.cap_height = self.ascent
+        os2 = tables.get('OS/2')
+        if os2 is not None and struct.unpack('>H', data[os2:os2 + 2])[0] >= 2:
+            self.cap_height = struct.unpack('>h', data[os2 + 88:os2 + 90])[0]
+        self.name = self._postscript_name(tables.get('name')) or os.path.splitext(os.path.basename(path))[0]
+        self.cmap = self._read_cmap(tables['cmap'])
+        self._widths = {}
+
+    def _postscript_name(self, offset):
+        if offset is None:
+            return None
+        data = self.data
+        count, strings = struct.unpack('>HH', data[offset + 2:offset + 6])
+        for index in range(count):
+            platform, encoding, _, name_id, length, start = struct.unpack(
+                '>6H', data[offset + 6 + 12 * index:offset + 18 + 12 * index])
+            if name_id == 6:
+                raw = data[offset + strings + start:offset + strings + start + length]
+                name = raw.decode('utf-16-be' if platform in (0, 3) else 'latin-1', errors='ignore')
+                return ''.join(char for char in name if char.isalnum() or char in '-_')
+        return None
+
+    def _read_cmap(self, offset):
+        data = self.data
+        subtables = {}
+        for index in range(struct.unpack('>H', data[offset + 2:offset + 4])[0]):
+            platform, encoding, sub_offset = struct.unpack('>HHI', data[offset + 4 + 8 * index:offset + 12 + 8 * index])
+            subtables[(platform, encoding)] = offset + sub_offset
+        for key in ((3, 10), (0, 4), (3, 1), (0, 3)):
+            start = subtables.get(key)
+            if start is None:
+                continue
+            table_format = struct.unpack('>H', data[start:start + 2])[0]
+            if table_format == 12:
+                return self._read_cmap_format12(start)
+            if table_format == 4:
+                return self._read_cmap_format4(start)
+        raise ValueError('font has no Unicode character map')
+
+    def _read_cmap_format4(self, start):
+        data = self.data
+        segments = struct.unpack('>H', data[start + 6:start + 8])[0] // 2
+        ends = struct.unpack(f'>{segments}H', data[start + 14:start + 14 + 2 * segments])
+        starts_at = start + 16 + 2 * segments
+        starts = struct.unpack(f'>{segments}H', data[starts_at:starts_at + 2 * segments])
+        deltas = struct.unpack(f'>{segments}h', data[starts_at + 2 * segments:starts_at + 4 * segments])
+        range_offsets_at = starts_at + 4 * segments
+        range_offsets = struct.unpack(f'>{segments}H', data[range_offsets_at:range_offsets_at + 2 * segments])
+        cmap = {}
+        for index in range(segments):
+            for code in range(starts[index], ends[index] + 1):
+                if code == 0xFFFF:
+                    continue
+                if range_offsets[index] == 0:
+                    glyph = (code + deltas[index]) & 0xFFFF
+                else:
+                    at = range_offsets_at + 2 * index + range_offsets[index] + 2 * (code - starts[index])
+                    glyph = struct.unpack('>H', data[at:at + 2])[0]
+                    if glyph:
+                        glyph = (glyph + deltas[index]) & 0xFFFF
+                if glyph:
+                    cmap[code] = glyph
+        return cmap
+
+    def _read_cmap_format12(self, start):
+        data = self.data
+        cmap = {}
+        for index in range(struct.unpack('>I', data[start + 12:start + 16])[0]):
+            first, last, glyph = struct.unpack('>3I', data[start + 16 + 12 * index:start + 28 + 12 * index])
+            for code in range(first, last + 1):
+                cmap[code] = glyph + code - first
+        return cmap
+
+    def glyph(self, char):
+        return self.cmap.get(ord(char), 0)
+
+    def width(self, text, size):
+        """Returns the advance width of ``text`` at ``size`` points."""
+        widths = self._widths
+        total = 0
+        for char in text:
+            advance = widths.get(char)
+            if advance is None:
+                advance = widths[char] = self.advances[self.glyph(char)]
+            total += advance
+        return total * size / self.units_per_em
+
+    def line_height(self, size):
+        return (self.ascent - self.descent + self.line_gap) * size / self.units_per_em * LINE_SPACING
+
+    def subset(self, glyphs):
+        """Returns a copy of the font whose glyf table only keeps ``glyphs`` (and their components).
+
+        Glyph IDs are left unchanged, so the Identity CIDToGIDMap still applies; every other glyph
+        is simply emptied, which is what keeps an embedded font small.
+        """
+        data, tables = self.data, self.tables
+        head = tables['head']
+        long_offsets = struct.unpack('>h', data[head + 50:head + 52])[0] == 1
+        glyph_count = len(self.advances)
+        if long_offsets:
+            offsets = struct.unpack(f'>{glyph_count + 1}I', data[tables['loca']:tables['loca'] + 4 * (glyph_count + 1)])
+        else:
+            offsets = [offset * 2 for offset in
+                       struct.unpack(f'>{glyph_count + 1}H', data[tables['loca']:tables['loca'] + 2 * (glyph_count + 1)])]
+        glyf = tables['glyf']
+
+        keep = set()
+        pending = [0, *glyphs]  # .notdef always stays
+        while pending:
+            glyph = pending.pop()
+            if glyph in keep or glyph >= glyph_count:
+                continue
+            keep.add(glyph)
+            start, end = glyf + offsets[glyph], glyf + offsets[glyph + 1]
+            if end - start >= 10 and struct.unpack('>h', data[start:start + 2])[0] < 0:
+                pending.extend(composite_components(data, start + 10))
+
+        new_glyf, new_loca = [], [0]
+        position = 0
+        for glyph in range(glyph_count):
+            if glyph in keep:
+                outline = data[glyf + offsets[glyph]:glyf + offsets[glyph + 1]]
+                outline += b'\0' * (-len(outline) % 4)
+                new_glyf.append(outline)
+                position += len(outline)
+            new_loca.append(position)
+
+        new_tables = {name: data[tables[name]:tables[name] + self.table_lengths[name]]
+                      for name in ('cvt ', 'fpgm', 'prep', 'hhea', 'hmtx', 'maxp') if name in tables}
+        head_table = bytearray(data[head:head + self.table_lengths['head']])
+        head_table[8:12] = b'\0\0\0\0'  # checkSumAdjustment no longer applies
+        head_table[50:52] = struct.pack('>h', 1)  # long loca offsets
+        new_tables['head'] = bytes(head_table)
+        new_tables['loca'] = struct.pack(f'>{len(new_loca)}I', *new_loca)
+        new_tables['glyf'] = b''.join(new_glyf)
+        return build_font_file(new_tables)
+
+    @lru_cache(maxsize=64)
+    def embedded_subset(self, glyphs):
+        """Returns (raw length, deflated bytes) of the subset for ``glyphs``, a sorted tuple."""
+        subset = self.subset(glyphs)
+        return len(subset), zlib.compress(subset)
+
+
+# Function to list the glyphs a composite glyph is built from
+def composite_components(data, position):
+    components = []
+    while True:
+        flags, glyph = struct.unpack('>HH', data[position:position + 4])
+        components.append(glyph)
+        position += 4 + (4 if flags & 0x0001 else 2)  # ARG_1_AND_2_ARE_WORDS
+        if flags & 0x0008:  # WE_HAVE_A_SCALE
+            position += 2
+        elif flags & 0x0040:  # WE_HAVE_AN_X_AND_Y_SCALE
+            position += 4
+        elif flags & 0x0080:  # WE_HAVE_A_TWO_BY_TWO
+            position += 8
+        if not flags & 0x0020:  # MORE_COMPONENTS
+            return components
+
+
+# Function to assemble a TrueType file from its tables
+def build_font_file(tables):
+    names = sorted(tables)
+    entry_selector = max(count for count in range(16) if 2 ** count <= len(names))
+    search_range = 2 ** entry_selector * 16
+    header = struct.pack('>IHHHH', 0x00010000, len(names), search_range, entry_selector,
+                         len(names) * 16 - search_range)
+    directory, body = [], []
+    offset = 12 + 16 * len(names)
+    for name in names:
+        table = tables[name]
+        padded = table + b'\0' * (-len(table) % 4)
+        checksum = sum(struct.unpack(f'>{len(padded) // 4}I', padded)) & 0xFFFFFFFF
+        directory.append(struct.pack('>4sIII', name.encode('latin-1'), checksum, offset, len(table)))
+        body.append(padded)
+        offset += len(padded)
+    return header + b''.join(directory) + b''.join(body)
+
+
+# Function to find a font file from the environment or the usual system font directories
+def find_font(weight):
+    configured = os.environ.get('RESUME_PDF_BOLD_FONT' if weight == 'bold' else 'RESUME_PDF_FONT')
+    if configured:
+        return configured
+    wanted = FONT_FILES[weight]
+    found = {}
+    for directory in FONT_DIRS:
+        for root, _, files in os.walk(os.path.expanduser(directory)):
+            for filename in files:
+                if filename in wanted:
+                    found.setdefault(filename, os.path.join(root, filename))
+    for filename in wanted:
+        if filename in found:
+            return found[filename]
+    return None
+
+
+@lru_cache(maxsize=None)
+def load_fonts():
+    """Returns the (regular, bold) fonts; bold is None when only a regular face is available."""
+    regular_path = find_font('regular')
+    if regular_path is None:
+        raise PdfFontError('No TrueType font found for PDF output; set RESUME_PDF_FONT to a .ttf file')
+    bold_path = find_font('bold')
+    return open_font(regular_path), open_font(bold_path) if bold_path else None
+
+
+# Function to read a font file, reporting a missing, unsupported or damaged file as PdfFontError
+def open_font(path):
+    try:
+        return TrueTypeFont(path)
+    except ValueError as exc:
+        raise PdfFontError(str(exc)) from None
+    except OSError as exc:
+        raise PdfFontError(f'Cannot read the PDF font {path}: {exc.strerror or exc}') from None
+    except (KeyError, struct.error):
+        raise PdfFontError(f'{path} is not a usable TrueType font (missing or damaged tables)') from None
+
+
+# Function to break one paragraph into lines that fit ``width``
+def wrap(text, font, size, width):
+    lines = []
+    for paragraph in text.replace('\t', ' ').replace('\r', '\n').split('\n'):
+        line = ''
+        for word in paragraph.split(' '):
+            candidate = f'{line} {word}' if line else word
+            if font.width(candidate, size) <= width or not line and font.width(word, size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # Words longer than a whole line are broken between characters
+            while font.width(word, size) > width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and font.width(word[:cut], size) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+# Collects the drawing operators and used glyphs of each page
+class PageCanvas:
+    def __init__(self, fonts):
+        self.fonts = fonts
+        self.pages = []
+        self.used = {id(font): {} for font in fonts if font is not None}
+        self.missing = {id(font): {} for font in fonts if font is not None}
+        self.new_page()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def text(self, x, baseline, text, font, resource, size, color, fake_bold):
+        used = self.used[id(font)]
+        glyphs = []
+        for char in text:
+            glyph = font.glyph(char)
+            if glyph == 0:
+                # The font has no glyph for char: give it its own code past the font's glyphs. It is drawn
+                # as .notdef, but the ToUnicode map still names the right character for text extraction
+                missing = self.missing[id(font)]
+                glyph = missing.setdefault(char, len(font.advances) + len(missing))
+            used.setdefault(glyph, char)
+            glyphs.append(f'{glyph:04X}')
+        red, green, blue = (component / 255 for component in color)
+        # Fake bold strokes the glyph outlines in the fill colour
+        mode = f'{red:.3f} {green:.3f} {blue:.3f} RG {size * 0.03:.2f} w 2 Tr ' if fake_bold else ''
+        self.ops.append(f'BT {mode}{red:.3f} {green:.3f} {blue:.3f} rg /{resource} {size:g} Tf '
+                        f'{x:.2f} {baseline:.2f} Td <{"".join(glyphs)}> Tj ET')
+
+    def rule(self, x1, x2, y):
+        red, green, blue = (component / 255 for component in ACCENT)
+        self.ops.append(f'{red:.3f} {green:.3f} {blue:.3f} RG {RULE_WIDTH} w {x1:.2f} {y:.2f} m {x2:.2f} {y:.2f} l S')
+
+
+def layout_rows(rows, styles, fonts):
+    """Places the rows on pages and returns the PageCanvas holding them."""
+    regular, bold = fonts
+    canvas = PageCanvas(fonts)
+    left, right = MARGIN, PAGE_WIDTH - MARGIN
+    text_width = right - left - 2 * CELL_PADDING
+    for text, formatting in rows:
+        _, is_bold, size, colored, centered = styles[formatting.get('style', 'ResumeBody')]
+        font = bold if is_bold and bold is not None else regular
+        resource = 'F2' if font is bold else 'F1'
+        fake_bold = is_bold and bold is None
+        color = ACCENT if colored else (0, 0, 0)
+        line_height = font.line_height(size)
+        ascent = font.ascent * size / font.units_per_em
+        lines = wrap(text if isinstance(text, str) else '', font, size, text_width)
+
+        if formatting.get('is_heading'):
+            # Exact-height row with the text sitting on the bottom edge, as in the DOCX table
+            if canvas.y - HEADING_HEIGHT < MARGIN:
+                canvas.new_page()
+            bottom = canvas.y - HEADING_HEIGHT
+            visible = max(1, min(len(lines), int((HEADING_HEIGHT - SPACE_AFTER) // line_height)))
+            top = bottom + SPACE_AFTER + visible * line_height
+            for index, line in enumerate(lines[-visible:]):
+                baseline = top - index * line_height - ascent
+                draw_line(canvas, line, baseline, font, resource, size, color, fake_bold, centered, left, right)
+            canvas.y = bottom
+        else:
+            remaining = lines
+            while remaining:
+                room = int((canvas.y - MARGIN) // line_height)
+                if room < 1:
+                    canvas.new_page()
+                    continue
+                chunk, remaining = remaining[:room], remaining[room:]
+                for index, line in enumerate(chunk):
+                    baseline = canvas.y - index * line_height - ascent
+                    draw_line(canvas, line, baseline, font, resource, size, color, fake_bold, centered, left, right)
+                canvas.y -= len(chunk) * line_height
+                if remaining:
+                    canvas.new_page()
+            canvas.y = max(MARGIN, canvas.y - SPACE_AFTER)
+        if formatting.get('is_border'):
+            canvas.rule(left, right, canvas.y)
+    return canvas
+
+
+# Function to draw one line of text, centered or from the left cell padding
+def draw_line(canvas, line, baseline, font, resource, size, color, fake_bold, centered, left, right):
+    if not line:
+        return
+    if centered:
+        x = (left + right - font.width(line, size)) / 2
+    else:
+        x = left + CELL_PADDING
+    canvas.text(x, baseline, line, font, resource, size, color, fake_bold)
+
+
+# Function to encode text as a PDF text string (UTF-16 with a byte order mark)
+def pdf_text_string(text):
+    return '<FEFF' + text.encode('utf-16-be').hex().upper() + '>'
+
+
+# Function to build the ToUnicode CMap that makes the glyph ids extractable as text
+def to_unicode_cmap(used):
+    lines = ['/CIDInit /ProcSet findresource begin', '12 dict begin', 'begincmap',
+             '/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def',
+             '/CMapName /Adobe-Identity-UCS def', '/CMapType 2 def',
+             '1 begincodespacerange', '<0000> <FFFF>', 'endcodespacerange']
+    mappings = sorted(used.items())
+    for start in range(0, len(mappings), 100):
+        block = mappings[start:start + 100]
+        lines.append(f'{len(block)} beginbfchar')
+        lines += [f'<{glyph:04X}> <{char.encode("utf-16-be").hex().upper()}>' for glyph, char in block]
+        lines.append('endbfchar')
+    lines += ['endcmap', 'CMapName currentdict /CMap defineresource pop', 'end', 'end']
+    return '\n'.join(lines).encode('ascii')
+
+
+class PdfObjects:
+    """Numbered PDF objects, serialized with a cross-reference table."""
+
+    def __init__(self):
+        self.objects = []
+
+    def reserve(self):
+        self.objects.append(None)
+        return len(self.objects)
+
+    def set(self, number, body):
+        self.objects[number - 1] = body if isinstance(body, bytes) else body.encode('latin-1')
+
+    def add(self, body):
+        number = self.reserve()
+        self.set(number, body)
+        return number
+
+    def stream(self, data, extra=''):
+        compressed = zlib.compress(data)
+        return self.add(f'<< /Length {len(compressed)} /Filter /FlateDecode{extra} >>\nstream\n'.encode('latin-1')
+                        + compressed + b'\nendstream')
+
+    def write(self, output, root, info):
+        output.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        position = 15
+        for number, body in enumerate(self.objects, 1):
+            offsets.append(position)
+            chunk = f'{number} 0 obj\n'.encode('latin-1') + body + b'\nendobj\n'
+            output.write(chunk)
+            position += len(chunk)
+        xref = [f'xref\n0 {len(self.objects) + 1}\n', '0000000000 65535 f \n']
+        xref += [f'{offset:010d} 00000 n \n' for offset in offsets]
+        xref.append(f'trailer\n<< /Size {len(self.objects) + 1} /Root {root} 0 R /Info {info} 0 R >>\n'
+                    f'startxref\n{position}\n%%EOF\n')
+        output.write(''.join(xref).encode('latin-1'))
+
+
+# Function to build a CIDToGIDMap that is the identity for the font's glyphs and glyph 0 past them
+def cid_to_gid_map(last_code, glyph_count):
+    return struct.pack(f'>{last_code + 1}H', *(code if code < glyph_count else 0 for code in range(last_code + 1)))
+
+
+# Function to embed one font as a Type0 font with an Identity-H encoding
+def embed_font(objects, font, used):
+    scale = 1000 / font.units_per_em
+    glyph_count = len(font.advances)
+    raw_length, compressed = font.embedded_subset(tuple(sorted(code for code in used if code < glyph_count)))
+    font_file = objects.add(f'<< /Length {len(compressed)} /Length1 {raw_length} /Filter /FlateDecode >>\n'
+                            'stream\n'.encode('latin-1') + compressed + b'\nendstream')
+    bbox = ' '.join(str(round(value * scale)) for value in font.bbox)
+    descriptor = objects.add(
+        f'<< /Type /FontDescriptor /FontName /{font.name} /Flags 32 /FontBBox [{bbox}] '
+        f'/ItalicAngle {font.italic_angle:g} /Ascent {round(font.ascent * scale)} '
+        f'/Descent {round(font.descent * scale)} /CapHeight {round(font.cap_height * scale)} /StemV 80 '
+        f'/FontFile2 {font_file} 0 R >>')
+    widths = ' '.join(f'{code} [{round(font.advances[code if code < glyph_count else 0] * scale)}]'
+                      for code in sorted(used))
+    cid_to_gid = '/Identity'
+    if max(used) >= glyph_count:
+        # Codes standing in for missing characters all draw glyph 0
+        cid_to_gid = f'{objects.stream(cid_to_gid_map(max(used), glyph_count))} 0 R'
+    cid_font = objects.add(
+        f'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{font.name} '
+        f'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> '
+        f'/FontDescriptor {descriptor} 0 R /W [{widths}] /CIDToGIDMap {cid_to_gid} >>')
+    to_unicode = objects.stream(to_unicode_cmap(used))
+    return objects.add(f'<< /Type /Font /Subtype /Type0 /BaseFont /{font.name} /Encoding /Identity-H '
+                       f'/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>')
+
+
+def write_pdf(rows, styles, output=None, title=None):
+    """Writes the laid out rows as a PDF; returns bytes when ``output`` is None.
+
+    ``styles`` maps each row's style ID to (name, bold, font size, coloured, centered).
+    """
+    fonts = load_fonts()
+    canvas = layout_rows(rows, styles, fonts)
+    objects = PdfObjects()
+    catalog, pages = objects.reserve(), objects.reserve()
+
+    resources = []
+    for resource, font in zip(('F1', 'F2'), fonts):
+        if font is not None and canvas.used[id(font)]:
+            resources.append(f'/{resource} {embed_font(objects, font, canvas.used[id(font)])} 0 R')
+    font_resources = ' '.join(resources)
+
+    kids = []
+    for ops in canvas.pages:
+        content = objects.stream('\n'.join(ops).encode('latin-1'))
+        kids.append(objects.add(f'<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {PAGE_WIDTH:g} {PAGE_HEIGHT:g}] '
+                                f'/Resources << /Font << {font_resources} >> >> /Contents {content} 0 R >>'))
+    objects.set(pages, f'<< /Type /Pages /Kids [{" ".join(f"{kid} 0 R" for kid in kids)}] /Count {len(kids)} >>')
+    objects.set(catalog, f'<< /Type /Catalog /Pages {pages} 0 R >>')
+    info = objects.add(f'<< /Title {pdf_text_string(title or "Resume")} /Producer (ATS Friendly Resume Generator) >>')
+
+    sink = BytesIO() if output is None else output
+    if isinstance(sink, (str, os.PathLike)):
+        with open(sink, 'wb') as file:
+            objects.write(file, catalog, info)
+        return sink
+    objects.write(sink, catalog, info)
+    return sink.getvalue() if output is None else output
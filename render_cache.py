@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+SPILL_SUFFIX = '.bin'
+
+
+# Function to turn the non-JSON inputs of generate_resume (dates) into stable values
+def _canonical_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot hash {type(value).__name__} resume input")
+
+
+def resume_key(*inputs, **options):
+    """Returns a content hash of every generate_resume input, in call order.
+
+    Keyword ``options`` that change the rendered bytes (such as compresslevel) are hashed too.
+    """
+    canonical = json.dumps([inputs, options], default=_canonical_value, ensure_ascii=False, sort_keys=True,
+                           separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Bounded LRU of rendered resumes keyed by resume_key, with an optional on-disk spill directory.
+
+    Entries evicted from memory to stay under ``max_bytes`` are written to ``spill_dir`` (when set)
+    and promoted back into memory on their next hit. The spill directory is itself an LRU capped
+    at ``max_spill_bytes``: the least recently used files are deleted once it grows past that.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, spill_dir=None, max_spill_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self.size = 0
+        self.spill_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._spilled = OrderedDict()  # key -> file size, least recently used first
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        self._spill_opened = not spill_dir
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+        data = self._read_spilled(key)
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self.put(key, data)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            # Too large to keep in memory at all; it can still live on disk
+            self._spill(key, data)
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = data
+            self.size += len(data)
+            evicted = []
+            while self.size > self.max_bytes:
+                old_key, old_data = self._entries.popitem(last=False)
+                self.size -= len(old_data)
+                self.evictions += 1
+                evicted.append((old_key, old_data))
+        for old_key, old_data in evicted:
+            self._spill(old_key, old_data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        self._open_spill_dir()
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.size, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'spilled_bytes': self.spill_size}
+
+    # Creates the spill directory and picks up what earlier processes spilled, on first use rather than in
+    # __init__, so a cache that is built but never used (as on every `streamlit run` rerun) costs no disk I/O
+    def _open_spill_dir(self):
+        if self._spill_opened:
+            return
+        with self._open_lock:
+            if self._spill_opened:
+                return
+            os.makedirs(self.spill_dir, exist_ok=True)
+            # Oldest first, so the earlier files count against the cap and are pruned first
+            found = []
+            for entry in os.scandir(self.spill_dir):
+                if entry.name.endswith(SPILL_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-len(SPILL_SUFFIX)], stat.st_size))
+            with self._lock:
+                for _, key, size in sorted(found):
+                    self._spilled[key] = size
+                    self.spill_size += size
+            self._spill_opened = True
+        self._prune_spilled()
+
+    def _spill_path(self, key):
+        # A neutral suffix: entries are .docx or PDF bytes depending on the key
+        return os.path.join(self.spill_dir, key + SPILL_SUFFIX)
+
+    def _spill(self, key, data):
+        if not self.spill_dir or len(data) > self.max_spill_bytes:
+            return
+        self._open_spill_dir()
+        with self._lock:
+            if key in self._spilled:
+                self._spilled.move_to_end(key)
+                return
+        # Write to a temporary file first so readers never see a partial resume
+        fd, tmp_path = tempfile.mkstemp(dir=self.spill_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, self._spill_path(key))
+        with self._lock:
+            if key not in self._spilled:
+                self._spilled[key] = len(data)
+                self.spill_size += len(data)
+        self._prune_spilled()
+
+    # Deletes the least recently used spill files until the directory is back under max_spill_bytes
+    def _prune_spilled(self):
+        stale = []
+        with self._lock:
+            while self.spill_size > self.max_spill_bytes and self._spilled:
+                old_key, old_size = self._spilled.popitem(last=False)
+                self.spill_size -= old_size
+                stale.append(old_key)
+        for old_key in stale:
+            try:
+                os.remove(self._spill_path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def _read_spilled(self, key):
+        if not self.spill_dir:
+            return None
+        self._open_spill_dir()
+        with self._lock:
+            if key not in self._spilled:
+                return None
+            self._spilled.move_to_end(key)
+        try:
+            with open(self._spill_path(key), 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,213 @@
+"""Local asynchronous render service around generate_resume.
+
+    python render_service.py --port 8765 --workers 2 --queue-depth 8 --timeout 30
+
+``POST /render`` takes a JSON resume record (the format bulk_generate reads, plus an optional
+``template`` name) and streams the .docx back. ``GET /health`` reports the pool's load. Renders run on a bounded process pool.
+Once ``workers + queue_depth`` renders are pending, new requests get ``429 Too Many Requests``
+straight away instead of queueing without limit. A render that takes longer than the timeout
+gets ``504``; a client that takes longer than ``--read-timeout`` to send its request gets ``408``.
+
+Point the Streamlit app at a running service with ``RESUME_RENDER_SERVICE=http://127.0.0.1:8765``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+from bulk_generate import parse_record, record_from_args, render_candidate, warm_worker
+from resume_template import list_templates
+
+logger = logging.getLogger('resume_generator.service')
+
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+MAX_BODY_BYTES = 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+MAX_RETRY_AFTER = 5.0
+
+
+class ServiceSaturated(Exception):
+    pass
+
+
+class RenderService:
+    """Dispatches renders to a bounded process pool and serves them over HTTP on localhost."""
+
+    def __init__(self, workers=2, queue_depth=8, timeout=30.0, backend='docx', read_timeout=10.0):
+        self.workers = workers
+        self.capacity = workers + queue_depth
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+        self.backend = backend
+        self.pending = 0
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_worker)
+
+    async def render(self, spec, template=None):
+        if self.pending >= self.capacity:
+            raise ServiceSaturated()
+        self.pending += 1
+        future = asyncio.get_running_loop().run_in_executor(self.pool, render_candidate, spec, self.backend, None,
+                                                            template)
+        # The slot is only freed when the worker is done, even if the client already timed out
+        future.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    def _release(self, future):
+        self.pending -= 1
+        if not future.cancelled():
+            future.exception()  # mark a late failure as retrieved
+
+    def health(self):
+        return {'status': 'ok', 'workers': self.workers, 'pending': self.pending, 'capacity': self.capacity}
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                status, headers, body = await self.respond(reader)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+                # Malformed, truncated, or a header line longer than the stream's 64 KiB limit
+                status, headers, body = HTTPStatus.BAD_REQUEST, {}, b''
+            except asyncio.TimeoutError:
+                # Render timeouts are answered inside respond; this is a client too slow to send its request
+                status, headers, body = HTTPStatus.REQUEST_TIMEOUT, {}, b''
+            await send_response(writer, status, headers, body)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, reader):
+        method, path, headers = await asyncio.wait_for(read_request_head(reader), self.read_timeout)
+        if path == '/health':
+            if method != 'GET':
+                return json_response(HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'use GET'})
+            return json_response(HTTPStatus.OK, self.health())
+        if path != '/render':
+            return json_response(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+        if method != 'POST':
+            return json_response(HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'use POST'})
+
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            return json_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'payload too large'})
+        try:
+            record = json.loads(await asyncio.wait_for(reader.readexactly(length), self.read_timeout))
+            spec = parse_record(record)
+            # Only the bundled templates by name; a client must not point the service at arbitrary files
+            template = record.get('template')
+            if template is not None and template not in list_templates():
+                raise ValueError(f'unknown template {template!r}')
+        except (ValueError, TypeError) as exc:
+            return json_response(HTTPStatus.BAD_REQUEST, {'error': str(exc)})
+
+        try:
+            resume_bytes = await self.render(spec, template)
+        except ServiceSaturated:
+            status, headers, body = json_response(HTTPStatus.TOO_MANY_REQUESTS, {'error': 'render queue is full'})
+            headers['Retry-After'] = '1'
+            return status, headers, body
+        except asyncio.TimeoutError:
+            return json_response(HTTPStatus.GATEWAY_TIMEOUT, {'error': f'render took longer than {self.timeout}s'})
+        except Exception as exc:
+            logger.exception('render failed')
+            return json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(exc)})
+        return HTTPStatus.OK, {'Content-Type': DOCX_MIME,
+                               'Content-Disposition': 'attachment; filename="resume.docx"'}, resume_bytes
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info('render service listening on %s:%s', host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+# Function to read the request line and headers of one HTTP/1.1 request
+async def read_request_head(reader):
+    request_line = (await reader.readuntil(b'\r\n')).decode('latin-1').split()
+    if len(request_line) != 3:
+        raise ValueError('malformed request line')
+    method, target, _ = request_line
+    headers = {}
+    while True:
+        line = (await reader.readuntil(b'\r\n')).decode('latin-1')
+        if line == '\r\n':
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return method, target.split('?')[0], headers
+
+
+def json_response(status, payload):
+    return status, {'Content-Type': 'application/json'}, json.dumps(payload).encode('utf-8')
+
+
+# Function to write one response, streaming the body in chunks so large resumes are not copied
+async def send_response(writer, status, headers, body):
+    head = [f'HTTP/1.1 {status.value} {status.phrase}', f'Content-Length: {len(body)}', 'Connection: close']
+    head += [f'{name}: {value}' for name, value in headers.items()]
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+    view = memoryview(body)
+    for start in range(0, len(body), CHUNK_BYTES):
+        writer.write(view[start:start + CHUNK_BYTES])
+        await writer.drain()
+    await writer.drain()
+
+
+def render_remote(base_url, *inputs, timeout=60, template=None, retries=1):
+    """Renders a resume on a running service; takes a ResumeSpec or generate_resume's positional arguments.
+
+    A 429 (queue full) is retried up to ``retries`` times after its Retry-After delay (at most
+    MAX_RETRY_AFTER seconds). Any other failure raises urllib's errors, which are all OSError.
+    """
+    record = record_from_args(*inputs)
+    if template is not None:
+        record['template'] = template
+    payload = json.dumps(record).encode('utf-8')
+    request = urllib.request.Request(base_url.rstrip('/') + '/render', data=payload, method='POST',
+                                     headers={'Content-Type': 'application/json'})
+    for attempt in range(retries + 1):
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as exc:
+            if exc.code != HTTPStatus.TOO_MANY_REQUESTS or attempt == retries:
+                raise
+            try:
+                delay = float(exc.headers.get('Retry-After') or 1)
+            except ValueError:
+                delay = 1.0
+            time.sleep(min(max(delay, 0.0), MAX_RETRY_AFTER))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve generate_resume over HTTP on localhost.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help='render worker processes')
+    parser.add_argument('--queue-depth', type=int, default=8, help='renders allowed to wait for a worker')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request render timeout in seconds')
+    parser.add_argument('--backend', choices=['docx', 'ooxml'], default='docx')
+    parser.add_argument('--read-timeout', type=float, default=10.0,
+                        help='seconds a client gets to send its request head and body')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    service = RenderService(args.workers, args.queue_depth, args.timeout, args.backend, args.read_timeout)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,63 +1,82 @@
 
 '-----------------------------------------------------------------------------'
+import time
+IMPORT_STARTED = time.perf_counter()
 import streamlit as st
-from docx import Document
-from docx.shared import Mm, Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from datetime import date
+from io import BytesIO
+from functools import lru_cache, wraps
+import copy
+import hashlib
+import json
+import re
+import statistics
+import zipfile
 import os
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.enum.table import WD_ROW_HEIGHT_RULE
-from datetime import datetime
+from render_cache import RenderCache, resume_key
+from instrumentation import Instrumentation, log_span, span
+from pdf_writer import PdfFontError, write_pdf
+from skill_taxonomy import load_taxonomy
+from resume_template import TEMPLATE_DIR, list_templates, load_template
+from resume_spec import SKILL_FIELDS, ResumeSpec, to_spec
+# python-docx, the importer (lxml) and the keyword scorer (numpy) are imported where first used, so the
+# app paints its form without waiting for them. IMPORT_SECONDS is what the imports above cost this run.
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
 
 
 
 
-# Function to add a bottom border to a cell
-def add_bottom_border_to_cell(cell):
-    tcPr = cell._element.get_or_add_tcPr()
+# Builds the single <w:tcBorders> a cell needs: every side nil, with an optional blue bottom rule
+@lru_cache(maxsize=None)
+def border_template(keep_bottom=False):
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
     tcBorders = OxmlElement('w:tcBorders')
-    bottomBorder = OxmlElement('w:bottom')
-    bottomBorder.set(qn('w:val'), 'single')  # Change 'single' to other styles if needed
-    bottomBorder.set(qn('w:sz'), '4')  # Border size (in eighths of a point)
-    bottomBorder.set(qn('w:space'), '0')  # No space between borders and content
-    bottomBorder.set(qn('w:color'), 'blue')  # Auto color or specify hex color
-    tcBorders.append(bottomBorder)
-    tcPr.append(tcBorders)
+    # Children follow the schema order of tcBorders (nil means no border)
+    for border in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
+        element = OxmlElement('w:' + border)
+        if border == 'bottom' and keep_bottom:
+            element.set(qn('w:val'), 'single')  # Change 'single' to other styles if needed
+            element.set(qn('w:sz'), '4')  # Border size (in eighths of a point)
+            element.set(qn('w:space'), '0')  # No space between borders and content
+            element.set(qn('w:color'), 'blue')  # Auto color or specify hex color
+        else:
+            element.set(qn('w:val'), 'nil')
+            element.set(qn('w:sz'), '0')
+            element.set(qn('w:space'), '0')
+            element.set(qn('w:color'), 'auto')
+        tcBorders.append(element)
+    return tcBorders
+
+# Function to set a cell's borders, keeping only the bottom rule if asked
+def set_cell_borders(cell, keep_bottom=False):
+    tcPr = cell._element.get_or_add_tcPr()
+    tcPr.append(copy.deepcopy(border_template(keep_bottom)))
 
 def set_vertical_alignment(cell, align="bottom"):
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
     tcPr = cell._element.get_or_add_tcPr()
     valign = OxmlElement('w:vAlign')
     valign.set(qn('w:val'), align)
     tcPr.append(valign)
 
-# Function to set a cell's borders to None
-def remove_borders_from_cell(cell, keep_bottom=False):
-    # Create a new property element for the cell
-    tcPr = cell._element.get_or_add_tcPr()
 
-    # Specify the border elements to be removed (nil means no border)
-    borders = ['top', 'left', 'right', 'insideH', 'insideV']
-    if not keep_bottom:  # If not keeping the bottom border, add it to the list to be removed
-        borders.append('bottom')
-
-    for border in borders:
-        tag = 'w:' + border
-        element = OxmlElement(tag)
-        element.set(qn('w:val'), 'nil')
-        element.set(qn('w:sz'), '0')
-        element.set(qn('w:space'), '0')
-        element.set(qn('w:color'), 'auto')
-        tcPr.append(element)
-
-
-def generate_resume(name, city, area_name, zipcode, email, phone, linkedin, summary,
-                    programming_languages, libraries, business_intelligence, data_engineering,
-                    big_data,
-                    degree, university, certifications, additional_skills, statistical_methods,
-                    data_collection, database_management, cloud_platforms, machine_learning,
-                    *experience_details):
-    """Generates an ATS-friendly resume with a visually appealing layout."""
+# Function to get the prebuilt prototype for a template's paragraph styles (default: the current template's)
+def build_prototype(styles=None):
+    return styled_prototype(styles or load_template().styles)
+
+
+# Builds the parts of the resume that never change between renders: margins, fonts and the empty table.
+# ``styles`` holds the template's paragraph styles as (style ID, (name, bold, font size, coloured, centered)) pairs.
+@lru_cache(maxsize=None)
+def styled_prototype(styles):
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.oxml.ns import qn
+    from docx.shared import Mm, Pt, RGBColor
     doc = Document()
 
     # Set narrow margins for a sleek design
@@ -73,149 +92,684 @@ def generate_resume(name, city, area_name, zipcode, email, phone, linkedin, summ
     font.name = 'Arial'
     font.size = Pt(11)
 
-    # Helper function to add and style cells
-    def add_and_style_cell(text, bold=False, centered=False, font_size=12, color=None,is_heading=False,align_bottom_left=False,is_border=False):
-        row = table.add_row()
-        cell = row.cells[0]  # Add a new row and get the first cell
-        paragraph = cell.paragraphs[0]
-        paragraph_format = paragraph.paragraph_format
-        paragraph_format.space_after = Pt(10)
-        paragraph_format.line_spacing = 1.15
-        run = paragraph.add_run(text)
-        run.bold = bold
-        run.font.size = Pt(font_size)
+    # Register the resume's paragraph styles once, so rows only reference them by ID. python-docx derives an ID
+    # from the name, which need not be the template's ID, so the template's is set explicitly
+    for style_id, (style_name, bold, font_size, color, centered) in styles:
+        style = doc.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+        style.style_id = style_id
+        style.base_style = doc.styles['Normal']
+        style.font.bold = bold
+        style.font.size = Pt(font_size)
         if color:
-            run.font.color.rgb = RGBColor(0, 102, 204)  # Dark blue color for headers
+            style.font.color.rgb = RGBColor(0, 102, 204)  # Dark blue color for headers
+        style.paragraph_format.space_after = Pt(10)
+        style.paragraph_format.line_spacing = 1.15
         if centered:
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        if is_heading:
-            # Set a specific height for heading rows
-            row.height_rule = WD_ROW_HEIGHT_RULE.EXACTLY  # Set the height rule
-            row.height = Mm(10)  # Example height, adjust as needed
-        if align_bottom_left:
-            set_vertical_alignment(cell, "bottom")
-        if is_border:
-            add_bottom_border_to_cell(cell)
-
-    # Initially, create a table with a single row for the header
-    table = doc.add_table(rows=1,cols=1)
-    table.style = 'Table Grid'
-
-
+            style.paragraph_format.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
-    # Add resume content
-    add_and_style_cell(name, bold=True, centered=True, font_size=18, color=True)
-    add_and_style_cell('Data Analyst', centered=True, color=True)
-    contact_info = f"{city}, {area_name}, {zipcode} | {email} | {phone} | {linkedin}"
-    add_and_style_cell(contact_info, centered=True,font_size=9,color='blue')
-    add_and_style_cell('SUMMARY', bold=True, color=True,font_size=12,is_heading=True,align_bottom_left=True,is_border=True)
-    add_and_style_cell(summary)
-
-    # Dynamic content from user input (skills, experience, etc.)
-    add_and_style_cell('TECHNICAL SKILLS', bold=True, color=True,is_heading=True,align_bottom_left=True,is_border=True)
-    skill_lines = [f"Programming Languages: {', '.join(programming_languages)}",
-                   f"Libraries: {', '.join(libraries)}",
-                   f"Business Intelligence: {', '.join(business_intelligence)}",
-                   f"Data Engineering: {', '.join(data_engineering)}",
-                   f"Big Data Tools: {', '.join(big_data)}",
-                   f"Statistical Methods: {', '.join(statistical_methods)}",
-                   f"Data Collection Techniques: {', '.join(data_collection)}",
-                   f"Database Management Systems: {', '.join(database_management)}",
-                   f"Cloud Platforms: {', '.join(cloud_platforms)}",
-                   f"Machine Learning Libraries: {', '.join(machine_learning)}"]
-    skill_lines = [f'• {line}' for line in skill_lines]
-    # skill_lines = [line for line in skill_lines if not line.endswith(': ')]  # Filter out empty lines
-    skills_text = '\n'.join(skill_lines)
-    add_and_style_cell(skills_text)
-
-    add_and_style_cell('PROFESSIONAL EXPERIENCE', bold=True, color=True,font_size=12,is_heading=True,align_bottom_left=True,is_border=True)
-    for idx, (profile, company_name, start_date, end_date, is_current_job, jd) in enumerate(experience_details, 1):
-        experience_text = f"{profile} at {company_name} ({start_date.strftime('%B %Y')} - {'Present' if is_current_job else end_date.strftime('%B %Y')})"
-        add_and_style_cell(f'{company_name}', bold=True, color=False, font_size=11, is_heading=False,
-                           align_bottom_left=True, is_border=True)
-        add_and_style_cell(experience_text)
-        job_desc = '\n'.join([f'• {j}' for j in jd.split('\n')])
-        add_and_style_cell(job_desc)  # Assuming 'jd' contains the job description
-
-    add_and_style_cell('EDUCATION', bold=True, color=True,font_size=12,is_heading=True,align_bottom_left=True,is_border=True)
-    education_text = f"{degree} from {university}"
-    add_and_style_cell(education_text)
-
-    # Handle certifications and additional skills similarly
-    add_and_style_cell('CERTIFICATIONS', bold=True, color=True,font_size=12,is_heading=True,align_bottom_left=True,is_border=True)
-    certs = certifications.split('\n')
-    cer = '\n'.join([f'• {cert}' for cert in certs])
-    add_and_style_cell(cer)
-
-    add_and_style_cell('ADDITIONAL SKILLS', bold=True, color=True,is_heading=True,align_bottom_left=True,is_border=True)
-    skills = additional_skills.split('\n')
-    skil = '\n'.join([f'• {skill}' for skill in skills])
-    add_and_style_cell(skil)
-
-    # Apply the no border function to each cell in the table
-
-    # Assuming you have a list of section headings for which you want to keep the bottom border
-    section_headings = ["SUMMARY", "TECHNICAL SKILLS", "PROFESSIONAL EXPERIENCE", "EDUCATION", "CERTIFICATIONS",
-                        "ADDITIONAL SKILLS"]
-
-    # Loop through each cell in the table and remove borders accordingly
-    for row in table.rows:
-        for cell in row.cells:
-            cell_text = cell.text.strip()  # Get the cell's text content, trimming any leading/trailing whitespace
-            if cell_text in section_headings:
-                # If the cell's text is one of the section headings, keep the bottom border
-                remove_borders_from_cell(cell, keep_bottom=True)
+    # Create an empty single-column table; every row is added by the renderer
+    table = doc.add_table(rows=0,cols=1)
+    table.style = 'Table Grid'
+    # Switch the grid off once for the whole table, so only ruled rows need cell borders
+    tblBorders = copy.deepcopy(border_template(keep_bottom=False))
+    tblBorders.tag = qn('w:tblBorders')
+    tblPr = table._tbl.tblPr
+    tblLook = tblPr.find(qn('w:tblLook'))
+    if tblLook is not None:
+        tblLook.addprevious(tblBorders)  # tblBorders precedes tblLook in tblPr
+    else:
+        tblPr.append(tblBorders)
+
+    # Only the document body and core properties are written per render; every other part
+    # (styles, theme, settings, fonts...) is shared read-only between the clones
+    package = doc.part.package
+    per_render = (doc.part, package.part_related_by(RT.CORE_PROPERTIES))
+    shared_parts = tuple(part for part in package.iter_parts() if part not in per_render)
+    return doc, shared_parts
+
+
+# Function to get a fresh document cloned from the prebuilt prototype
+def new_document(styles=None):
+    prototype, shared_parts = build_prototype(styles)
+    memo = {id(part): part for part in shared_parts}
+    # Copy the document part rather than the Document proxy, whose cached body would be detached by the copy
+    return copy.deepcopy(prototype.part, memo).document
+
+
+# Zip timestamp given to every package member so output bytes depend only on the content
+DOCX_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+# Shared across sessions: identical form submissions reuse the same rendered bytes. Its spill directory is only
+# opened on first use, so the unused copy each `streamlit run` rerun builds in __main__ touches no disk
+render_cache = RenderCache(max_bytes=int(os.environ.get('RESUME_CACHE_BYTES', 64 * 1024 * 1024)),
+                           spill_dir=os.environ.get('RESUME_CACHE_DIR') or None,
+                           max_spill_bytes=int(os.environ.get('RESUME_CACHE_SPILL_BYTES', 256 * 1024 * 1024)))
+
+
+# Function to add a new row to the resume table and style its single cell
+def add_and_style_cell(table, text, style='ResumeBody', is_heading=False, align_bottom_left=False, is_border=False):
+    from docx.enum.table import WD_ROW_HEIGHT_RULE
+    from docx.shared import Mm
+    row = table.add_row()
+    cell = row.cells[0]  # Add a new row and get the first cell
+    paragraph = cell.paragraphs[0]
+    # Fonts, colours and spacing come from the named style registered in build_prototype
+    paragraph._p.style = style
+    paragraph.add_run(text)
+    if is_heading:
+        # Set a specific height for heading rows
+        row.height_rule = WD_ROW_HEIGHT_RULE.EXACTLY  # Set the height rule
+        row.height = Mm(10)  # Example height, adjust as needed
+    # The row's role is known here, so a ruled row gets its bottom border once (tcBorders precedes vAlign in tcPr)
+    if is_border:
+        set_cell_borders(cell, keep_bottom=True)
+    if align_bottom_left:
+        set_vertical_alignment(cell, "bottom")
+    return row
+
+
+# Builds, once per formatting, an empty styled row that every row with that formatting is copied from
+@lru_cache(maxsize=None)
+def row_prototype(style='ResumeBody', is_heading=False, align_bottom_left=False, is_border=False):
+    from docx.oxml.ns import qn
+    tr = add_and_style_cell(new_document().tables[0], '', style, is_heading, align_bottom_left, is_border)._tr
+    for run in tr.findall('.//' + qn('w:r')):
+        run.getparent().remove(run)
+    return tr
+
+
+# Function to build a detached row as a copy of its formatting's prebuilt row
+def new_row(text, formatting):
+    tr = copy.deepcopy(row_prototype(**formatting))
+    # What Paragraph.add_run does, minus the proxy objects
+    run = tr.tc_lst[0].p_lst[0].add_r()
+    if text:
+        run.text = text
+    return tr
+
+
+# Function to append a row to the resume table
+def append_row(table, text, formatting):
+    tr = new_row(text, formatting)
+    table._tbl.append(tr)
+    return tr
+
+
+def resume_taxonomy():
+    """Returns the compiled skill taxonomy, checking its categories map onto generate_resume's skill lists."""
+    taxonomy = load_taxonomy()
+    unknown = [category['id'] for category in taxonomy.categories if category['id'] not in SKILL_FIELDS]
+    if unknown:
+        raise ValueError(f"skill taxonomy has categories generate_resume does not take: {', '.join(unknown)}")
+    return taxonomy
+
+
+def resume_sections(*inputs, template=None):
+    """Lays the resume out as a list of (section id, rows) pairs, each row a (text, formatting) tuple.
+
+    Takes a resume_spec.ResumeSpec, or generate_resume's positional arguments to build one from.
+    ``template`` is a resume_template name, path or CompiledTemplate (default: RESUME_TEMPLATE
+    or the Data Analyst layout).
+    """
+    return load_template(template).layout(to_spec(inputs), resume_taxonomy())
+
+
+def resume_rows(*inputs, template=None):
+    """Lays the resume out as a flat list of (text, formatting) rows, one per table row."""
+    return [row for _, rows in resume_sections(*inputs, template=template) for row in rows]
+
+
+def generate_resume(*inputs, output=None, backend='docx', cache=render_cache, instrument=None, compresslevel=None,
+                    file_format='docx', template=None):
+    """Generates an ATS-friendly resume with a visually appealing layout.
+
+    ``inputs`` is a resume_spec.ResumeSpec, or the fields of resume_spec.RESUME_FIELDS in order
+    followed by (profile, company_name, start_date, end_date, is_current_job, jd) experience
+    tuples, which are normalized and validated into one (ValueError if bad).
+    With ``output=None`` the rendered .docx is returned as bytes and nothing touches disk.
+    Pass a file path (or a writable file-like object) as ``output`` to save it there instead.
+    ``backend='ooxml'`` streams document.xml straight into the zip instead of building a
+    python-docx tree, falling back to python-docx for rows it cannot write.
+    Renders are memoized in ``cache`` by a hash of the inputs; pass ``cache=None`` to always render.
+    ``instrument`` (an instrumentation.Instrumentation) receives a timed span for every stage.
+    Output is deterministic; ``compresslevel`` picks the deflate level, 0 meaning store-only.
+    ``file_format='pdf'`` writes a PDF from the same layout instead of a .docx.
+    ``template`` picks the layout (a resume_template name, path or CompiledTemplate).
+    """
+    if backend not in ('docx', 'ooxml'):
+        raise ValueError(f"Unknown backend: {backend}")
+    if file_format not in ('docx', 'pdf'):
+        raise ValueError(f"Unknown file format: {file_format}")
+    spec = to_spec(inputs)
+    template = load_template(template)
+    with span(instrument, 'total'):
+        if cache is None:
+            return render_resume(resume_rows_timed(spec, instrument, template), output, backend, instrument,
+                                 compresslevel, file_format, template)
+
+        # Identical submissions are served from the cache without touching python-docx
+        with span(instrument, 'cache_lookup'):
+            key = resume_key(spec.to_list(), compresslevel=compresslevel, file_format=file_format,
+                             template=template.digest, taxonomy=resume_taxonomy().digest)
+            resume_bytes = cache.get(key)
+        if resume_bytes is None:
+            resume_bytes = render_resume(resume_rows_timed(spec, instrument, template), None, backend, instrument,
+                                         compresslevel, file_format, template)
+            cache.put(key, resume_bytes)
+        return write_output(resume_bytes, output)
+
+
+# Function to lay out a spec's rows inside a 'layout' span
+def resume_rows_timed(spec, instrument=None, template=None):
+    with span(instrument, 'layout'):
+        return resume_rows(spec, template=template)
+
+
+def generate_documents(*inputs, file_formats=('docx', 'pdf'), backend='docx', cache=render_cache,
+                       instrument=None, compresslevel=None, template=None, renderer=None):
+    """Renders several file formats from a single layout pass; returns {file format: bytes}.
+
+    Takes generate_resume's positional arguments (or a ResumeSpec) and its rendering options.
+    With an IncrementalRenderer as ``renderer`` the .docx is built by patching its document tree.
+    Each format is cached as soon as it is rendered, so a failure in a later one keeps the earlier.
+    """
+    spec = to_spec(inputs)
+    template = load_template(template)
+    documents = {}
+    sections = None
+    for file_format in file_formats:
+        key = resume_key(spec.to_list(), compresslevel=compresslevel, file_format=file_format,
+                         template=template.digest, taxonomy=resume_taxonomy().digest)
+        resume_bytes = cache.get(key) if cache is not None else None
+        if resume_bytes is None:
+            if sections is None:
+                with span(instrument, 'layout'):
+                    sections = resume_sections(spec, template=template)
+            if file_format == 'docx' and renderer is not None:
+                resume_bytes = renderer.render_sections(sections, template, instrument, compresslevel)
             else:
-                # Otherwise, remove all borders
-                remove_borders_from_cell(cell)
-    row = table.rows[0]._element
-    row.getparent().remove(row)
-
-
+                rows = [row for _, section_rows in sections for row in section_rows]
+                resume_bytes = render_resume(rows, None, backend, instrument, compresslevel, file_format, template)
+            if cache is not None:
+                cache.put(key, resume_bytes)
+        documents[file_format] = resume_bytes
+    return documents
+
+
+# Function to render the laid out rows with the chosen backend, in the paragraph styles of the rows' template
+def render_resume(rows, output=None, backend='docx', instrument=None, compresslevel=None, file_format='docx',
+                  template=None):
+    styles = load_template(template).styles
+    if file_format == 'pdf':
+        with span(instrument, 'pdf_write'):
+            return write_pdf(rows, dict(styles), output, title=rows[0][0] if rows else None)
+    if backend == 'ooxml' and ooxml_supports(rows):
+        with span(instrument, 'ooxml_write'):
+            return write_ooxml(rows, output, compresslevel, styles)
+    doc = render_docx(rows, instrument, styles)
+    with span(instrument, 'save'):
+        return save_document(doc, output, compresslevel)
+
+
+# Function to hand already rendered bytes to the requested sink
+def write_output(resume_bytes, output=None):
+    if output is None:
+        return resume_bytes
+    if hasattr(output, 'write'):
+        output.write(resume_bytes)
+    else:
+        with open(output, 'wb') as file:
+            file.write(resume_bytes)
+    return output
+
+
+# Function to build the python-docx document for the laid out rows
+def render_docx(rows, instrument=None, styles=None):
+    with span(instrument, 'document'):
+        doc = new_document(styles)
+        table = doc.tables[0]
+    with span(instrument, 'rows'):
+        for text, formatting in rows:
+            append_row(table, text, formatting)
+    return doc
+
+
+# Function to hash a section's rows so unchanged sections can be recognised between renders
+def section_hash(rows):
+    canonical = json.dumps([(text, sorted(formatting.items())) for text, formatting in rows],
+                           ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class IncrementalRenderer:
+    """Keeps one session's document tree and rebuilds only the sections whose content changed.
+
+    ``sections`` maps each section id to its content hash and table rows. On every render the
+    new layout is compared section by section; unchanged sections (matched by hash, so entries
+    that merely moved are reused too) keep their rows, and only changed ones are rebuilt before
+    the tree is serialized again.
+    """
+
+    def __init__(self):
+        self.doc = None
+        self.table = None
+        self.styles = None
+        self.sections = {}
+        self.rebuilt = []
+
+    def render(self, *inputs, output=None, cache=render_cache, instrument=None, compresslevel=None, template=None):
+        spec = to_spec(inputs)
+        template = load_template(template)
+        if cache is not None:
+            key = resume_key(spec.to_list(), compresslevel=compresslevel, file_format='docx', template=template.digest,
+                             taxonomy=resume_taxonomy().digest)
+            resume_bytes = cache.get(key)
+            if resume_bytes is not None:
+                return write_output(resume_bytes, output)
+        with span(instrument, 'layout'):
+            sections = resume_sections(spec, template=template)
+        resume_bytes = self.render_sections(sections, template, instrument, compresslevel)
+        if cache is not None:
+            cache.put(key, resume_bytes)
+        return write_output(resume_bytes, output)
+
+    def render_sections(self, sections, template, instrument=None, compresslevel=None):
+        """Patches the tree to already laid out sections of ``template`` and returns the .docx bytes."""
+        with span(instrument, 'rows'):
+            self.patch(sections, template.styles)
+        with span(instrument, 'save'):
+            return save_document(self.doc, None, compresslevel)
+
+    def patch(self, sections, styles=None):
+        styles = styles or load_template().styles
+        # A template with other paragraph styles needs a document built on its own prototype
+        if self.doc is None or styles != self.styles:
+            self.doc = new_document(styles)
+            self.table = self.doc.tables[0]
+            self.styles = styles
+            self.sections = {}
+        reusable = {}
+        for digest, trs in self.sections.values():
+            reusable.setdefault(digest, []).append(trs)
+
+        # Changed sections are built detached, so a row that fails leaves the table and model as they were
+        model = {}
+        rebuilt = []
+        for section_id, rows in sections:
+            digest = section_hash(rows)
+            if reusable.get(digest):
+                trs = reusable[digest].pop()
+            else:
+                trs = [new_row(text, formatting) for text, formatting in rows]
+                rebuilt.append(section_id)
+            model[section_id] = (digest, trs)
+        self.rebuilt = rebuilt
+
+        # Drop the rows of sections that changed or disappeared, then put every row back in layout order
+        tbl = self.table._tbl
+        for stale in reusable.values():
+            for trs in stale:
+                for tr in trs:
+                    tbl.remove(tr)
+        for _, trs in model.values():
+            for tr in trs:
+                tbl.append(tr)
+        self.sections = model
+
+
+# Function to write the document to the requested sink
+def save_document(doc, output=None, compresslevel=None):
+    return write_package(package_members(doc), output, compresslevel)
+
+
+# Collects the package members python-docx would write, instead of zipping them straight away
+class MemberCollector:
+    def __init__(self):
+        self.members = []
+
+    def write(self, pack_uri, blob):
+        self.members.append((pack_uri.membername, blob))
+
+
+# Function to list a python-docx document's package as (member name, bytes) pairs
+def package_members(doc):
+    from docx.opc.pkgwriter import PackageWriter
+    package = doc.part.package
+    for part in package.parts:
+        part.before_marshal()
+    # Same steps as PackageWriter.write, minus its fixed-deflate, timestamped zip writer
+    collector = MemberCollector()
+    PackageWriter._write_content_types_stream(collector, package.parts)
+    PackageWriter._write_pkg_rels(collector, package.rels)
+    PackageWriter._write_parts(collector, package.parts)
+    return collector.members
+
+
+# Function to order package members stably: the content types first, then by name
+def member_order(member):
+    return (member[0] != '[Content_Types].xml', member[0])
+
+
+def write_package(members, output=None, compresslevel=None):
+    """Zips (member name, data) pairs into a .docx deterministically.
+
+    Every member gets the same fixed timestamp and members are written in a stable order,
+    so identical inputs always give identical bytes. ``compresslevel`` 1-9 selects the
+    deflate level (None for zlib's default) and 0 stores members uncompressed, the fast
+    path for pipelines that re-zip the output anyway. ``data`` may be bytes or an iterable
+    of byte chunks, which is streamed into the member.
+    """
+    sink = BytesIO() if output is None else output
+    compression = zipfile.ZIP_STORED if compresslevel == 0 else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(sink, 'w', compression=compression) as package:
+        for filename, data in sorted(members, key=member_order):
+            info = zipfile.ZipInfo(filename, date_time=DOCX_TIMESTAMP)
+            info.compress_type = compression
+            info._compresslevel = compresslevel or None  # ZipInfo has no public setter before 3.13
+            if isinstance(data, bytes):
+                package.writestr(info, data)
+                continue
+            with package.open(info, 'w') as member:
+                for chunk in data:
+                    member.write(chunk)
+    return sink.getvalue() if output is None else output
+
+
+# Characters python-docx would reject or write differently; rows containing them go through python-docx
+UNSUPPORTED_OOXML_TEXT = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+OOXML_SENTINEL = 'OOXML-ROW-TEXT'
+
+
+# Function to check whether the streaming writer can produce every row
+def ooxml_supports(rows):
+    return all(isinstance(text, str) and not UNSUPPORTED_OOXML_TEXT.search(text) for text, _ in rows)
+
+
+# Splits the prototype's document.xml around its empty table, and keeps every other package member as-is
+@lru_cache(maxsize=None)
+def ooxml_package(styles):
+    prototype, _ = styled_prototype(styles)
+    blob = prototype.part.blob
+    split = blob.rindex(b'</w:tbl>')
+    members = tuple(member for member in package_members(prototype) if member[0] != 'word/document.xml')
+    return blob[:split], blob[split:], members
+
+
+# Compiles the XML written around a row's text for one combination of formatting flags
+@lru_cache(maxsize=None)
+def ooxml_row_fragment(style='ResumeBody', is_heading=False, align_bottom_left=False, is_border=False):
+    # Render a single sentinel row with python-docx so both backends share the exact same markup
+    doc = new_document()
+    add_and_style_cell(doc.tables[0], OOXML_SENTINEL, style=style, is_heading=is_heading,
+                       align_bottom_left=align_bottom_left, is_border=is_border)
+    head, tail, _ = ooxml_package(load_template().styles)
+    row = doc.part.blob[len(head):-len(tail)]
+    prefix, suffix = row.split(f'<w:r><w:t>{OOXML_SENTINEL}</w:t></w:r>'.encode())
+    return prefix, suffix
+
+
+# Function to write a run the way python-docx does: <w:t> for text, <w:tab/> and <w:br/> for \t, \r and \n
+def ooxml_run_content(text):
+    if not text:
+        return b'<w:r/>'
+    parts = ['<w:r>']
+    for piece in re.split('([\t\r\n])', text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        elif piece:
+            escaped = piece.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            if len(piece.strip()) < len(piece):
+                parts.append(f'<w:t xml:space="preserve">{escaped}</w:t>')
+            else:
+                parts.append(f'<w:t>{escaped}</w:t>')
+    parts.append('</w:r>')
+    return ''.join(parts).encode()
+
+
+# Function to stream the laid out rows into a .docx package without building a python-docx tree
+def write_ooxml(rows, output=None, compresslevel=None, styles=None):
+    head, tail, members = ooxml_package(styles or load_template().styles)
+    return write_package(members + (('word/document.xml', ooxml_document_chunks(head, rows, tail)),),
+                         output, compresslevel)
+
+
+# Function to generate document.xml chunk by chunk from the compiled row fragments
+def ooxml_document_chunks(head, rows, tail):
+    yield head
+    for text, formatting in rows:
+        prefix, suffix = ooxml_row_fragment(**formatting)
+        yield prefix
+        yield ooxml_run_content(text)
+        yield suffix
+    yield tail
+
+
+# Most options a skill multiselect is given, so large taxonomies stay quick to rerun
+MAX_SKILL_OPTIONS = 50
+PREFILL_FIELDS = ['name', 'city', 'area_name', 'zipcode', 'email', 'phone', 'linkedin', 'summary',
+                  'degree', 'university', 'certifications', 'additional_skills']
+
+
+# Function to list a skill multiselect's options: its current selection plus matches for the skill search
+def skill_options(taxonomy, category_id, query=''):
+    selected = st.session_state.get(category_id, [])
+    # New options make Streamlit treat the multiselect as a new widget; re-assigning keeps its selection
+    st.session_state[category_id] = selected
+    matches = taxonomy.search(query, MAX_SKILL_OPTIONS, category_id)
+    return selected + [skill for skill in matches if skill not in selected]
+
+
+# Function to copy an imported resume into the form's widget state; returns the skills the taxonomy doesn't know
+def prefill_form(record):
+    for field in PREFILL_FIELDS:
+        st.session_state[field] = record[field]
+    unmatched = []
+    taxonomy = resume_taxonomy()
+    for category in taxonomy.categories:
+        skills = record.get(category['id'], [])
+        st.session_state[category['id']] = taxonomy.canonicalize(skill for skill in skills if taxonomy.canonical(skill))
+        unmatched += [skill for skill in skills if not taxonomy.canonical(skill)]
+    experiences = record['experience_details']
+    st.session_state['experience_count'] = len(experiences)
+    for i, experience in enumerate(experiences, 1):
+        start_date = date.fromisoformat(experience['start_date'])
+        st.session_state[f'profile_{i}'] = experience['profile']
+        st.session_state[f'company_{i}'] = experience['company_name']
+        st.session_state[f'start_date_{i}'] = start_date
+        st.session_state[f'end_date_{i}'] = (date.fromisoformat(experience['end_date'])
+                                             if experience['end_date'] else start_date)
+        st.session_state[f'current_{i}'] = experience['is_current_job']
+        st.session_state[f'jd_{i}'] = experience['jd']
+    return unmatched
+
+
+# Function to memoize an app helper with st.cache_data, applied on first call: decorating at import time would
+# log a warning in every script that imports this module outside `streamlit run` (bulk_generate, benchmark...)
+def lazy_cache_data(**options):
+    def decorate(function):
+        cached = []
+
+        @wraps(function)
+        def call(*args):
+            if not cached:
+                cached.append(st.cache_data(**options)(function))
+            return cached[0](*args)
+        return call
+    return decorate
+
+
+@lazy_cache_data(max_entries=64)
+def template_labels(modified):
+    """Maps each template's display name to its name; ``modified`` (TEMPLATE_DIR's mtime) refreshes it."""
+    return {load_template(name).name: name for name in list_templates()}
+
+
+@lazy_cache_data(max_entries=256)
+def keyword_report(postings, spec, template=None):
+    """Returns (title, coverage, missing keywords) per job posting for a generated resume."""
+    from ats_score import KeywordMatcher, resume_terms, tokenize
+    matcher = KeywordMatcher([tokenize(posting) for posting in postings])
+    terms = resume_terms(spec, template)
+    coverage = matcher.score([terms], 'coverage')[0]
+    return [(posting.splitlines()[0][:60], float(coverage[index]), matcher.missing(terms, index))
+            for index, posting in enumerate(postings)]
+
+
+# Function to show how well the generated resume matches pasted job descriptions
+def keyword_match_panel(spec, template=None):
+    with st.expander('ATS Keyword Match'):
+        text = st.text_area('Job Descriptions', key='job_descriptions',
+                            placeholder='Paste one or more job descriptions, separated by a line of ---')
+        postings = [posting.strip() for posting in re.split(r'^\s*-{3,}\s*$', text, flags=re.M) if posting.strip()]
+        if not postings:
+            return
+        # Reruns with the same postings and resume (every other widget interaction) reuse the scores
+        for index, (title, coverage, missing) in enumerate(keyword_report(postings, spec, template)):
+            st.metric(f'Job {index + 1}: {title}', f'{coverage:.0%} keyword match')
+            if missing:
+                st.write(f"Missing keywords: {', '.join(missing)}")
+
+
+# Function to start timing a rerun when RESUME_PROFILE is set; returns (instrument, stage timings in ms)
+def rerun_profiler():
+    if os.environ.get('RESUME_PROFILE', '') in ('', '0'):
+        return None, None
+    timings = {}
+
+    def record(stage, seconds, allocated_blocks):
+        timings[stage] = timings.get(stage, 0) + seconds * 1000
+    return Instrumentation(record, log_span), timings
+
+
+# Function to show the rerun's import and stage timings and this session's rerun history
+def profile_panel(timings, import_seconds=0.0):
+    timings = dict(imports=import_seconds * 1000, **timings)
+    timings['total'] += timings['imports']
+    runs = st.session_state.setdefault('profile_runs', [])
+    runs.append(timings['total'])
+    with st.sidebar:
+        st.subheader('Profile')
+        st.text('\n'.join(f'{stage:<14}{ms:8.1f} ms' for stage, ms in timings.items()))
+        st.text(f'{len(runs)} runs: first {runs[0]:.1f} ms, median {statistics.median(runs):.1f} ms, '
+                f'last {runs[-1]:.1f} ms')
+
+
+def main(import_seconds=0.0):
+    """Runs the Streamlit app; ``import_seconds`` is what this run spent importing the script's modules.
+
+    With RESUME_PROFILE=1 the sidebar shows where each rerun's time went. The first run's
+    imports are the cold start.
+    """
+    instrument, timings = rerun_profiler()
+    with span(instrument, 'total'):
+        resume_app(instrument)
+    if timings is not None:
+        profile_panel(timings, import_seconds)
+
+
+# Function to draw the form and handle a submission; ``instrument`` times each part of the rerun
+def resume_app(instrument=None):
+    with span(instrument, 'header'):
+        st.title('ATS Friendly Resume Generator')
+        uploaded = st.file_uploader('Import an existing resume (.docx) to prefill the form', type='docx')
+        # Prefill once per upload, so later edits in the form are not overwritten on every rerun
+        if uploaded is not None and st.session_state.get('imported_resume') != (uploaded.name, uploaded.size):
+            st.session_state['imported_resume'] = (uploaded.name, uploaded.size)
+            from resume_importer import import_resume
+            try:
+                unmatched = prefill_form(import_resume(uploaded))
+            except ValueError as exc:
+                st.error(f'Could not import {uploaded.name}: {exc}')
+            else:
+                if unmatched:
+                    st.info(f"Skills not in the skill taxonomy were left out: {', '.join(unmatched)}")
+    with span(instrument, 'form'):
+        taxonomy = resume_taxonomy()
+        skill_query = st.text_input('Search skills',
+                                    placeholder='Type a skill or synonym to find it in the lists below')
+        submitted, template, resume_inputs = resume_form_widgets(taxonomy, skill_query)
+
+    spec = None
+    if submitted:
+        try:
+            # One pass trims the fields, drops empty bullets and checks every experience's dates
+            spec = ResumeSpec.from_args(*resume_inputs)
+        except ValueError as exc:
+            st.error(f'Could not generate the resume: {exc}')
+    if spec is not None:
+        service_url = os.environ.get('RESUME_RENDER_SERVICE')
+        with span(instrument, 'render'):
+            documents = {}
+            if service_url:
+                # Render on the local render service so a slow render doesn't block this script thread
+                from render_service import render_remote
+                try:
+                    documents['docx'] = render_remote(service_url, spec, template=template)
+                except OSError as exc:
+                    # Still busy after its Retry-After (429), timed out (504) or down: render here instead
+                    st.warning(f'Render service unavailable ({exc}); rendering the resume here instead.')
+            # One layout pass feeds both files; each session keeps its own document tree, so a regenerate only
+            # rebuilds the edited sections of the .docx
+            renderer = st.session_state.setdefault('resume_renderer', IncrementalRenderer())
+            file_formats = [file_format for file_format in ('docx', 'pdf') if file_format not in documents]
+            try:
+                documents.update(generate_documents(spec, file_formats=file_formats, template=template,
+                                                    instrument=instrument, renderer=renderer))
+            except PdfFontError as exc:
+                # No usable PDF font: none installed, or RESUME_PDF_FONT is a .ttc/.otf the writer can't embed.
+                # The .docx was cached before the PDF failed, so asking for it alone costs a lookup
+                st.info(f'PDF download unavailable: {exc}')
+                if 'docx' in file_formats:
+                    documents.update(generate_documents(spec, file_formats=['docx'], template=template,
+                                                        instrument=instrument, renderer=renderer))
+
+        st.session_state['resume_bytes'] = documents['docx']  # Keep the rendered resume in this session only
+        st.session_state['resume_spec'] = spec
+        st.session_state['resume_template'] = template
+        if 'pdf' in documents:
+            st.session_state['resume_pdf'] = documents['pdf']
+        else:
+            st.session_state.pop('resume_pdf', None)
+
+    # Check if the resume has been generated and offer a download button; both payloads are served from memory
+    with span(instrument, 'downloads'):
+        if 'resume_bytes' in st.session_state:
+            st.download_button(label="Download Resume", data=st.session_state['resume_bytes'],
+                               file_name="resume.docx",
+                               mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+        if 'resume_pdf' in st.session_state:
+            st.download_button(label="Download PDF", data=st.session_state['resume_pdf'], file_name="resume.pdf",
+                               mime='application/pdf')
+    if 'resume_spec' in st.session_state:
+        with span(instrument, 'keyword_match'):
+            keyword_match_panel(st.session_state['resume_spec'], st.session_state.get('resume_template'))
 
-    # Save the document
-    file_path = os.path.join(os.getcwd(), 'resume.docx')
-    doc.save(file_path)
-    return file_path
 
-def main():
-    st.title('ATS Friendly Resume Generator')
+# Function to draw the resume form; returns (submitted, template name, generate_resume's positional arguments)
+def resume_form_widgets(taxonomy, skill_query=''):
     with st.form("resume_form"):
 
         # UI for input fields
         with st.expander('Personal Details:'):
-            name = st.text_input('Name')
-            city = st.text_input('City')
-            area_name = st.text_input('Area')
-            zipcode = st.text_input('Zipcode')
-            email = st.text_input('Email')
-            phone = st.text_input('Phone')
-            linkedin = st.text_input('LinkedIn')
-            summary = st.text_area('Summary', placeholder='Write a Brief Summary')
+            name = st.text_input('Name', key='name')
+            city = st.text_input('City', key='city')
+            area_name = st.text_input('Area', key='area_name')
+            zipcode = st.text_input('Zipcode', key='zipcode')
+            email = st.text_input('Email', key='email')
+            phone = st.text_input('Phone', key='phone')
+            linkedin = st.text_input('LinkedIn', key='linkedin')
+            summary = st.text_area('Summary', placeholder='Write a Brief Summary', key='summary')
         with st.expander('Skills'):
-            statistical_methods = st.multiselect(label='Statistical methods',
-                                                 options=['Statistical Techniques', 'Descriptive Statistics',
-                                                          'Inferential Statistics', 'Probability Distribution',
-                                                          'Hypothesis Testing', 'Regression'])
-            programming_languages = st.multiselect(label='Programming Languages', options=['Python', 'SQL'])
-            data_collection = st.multiselect(label='Data Collection',
-                                             options=['requests', 'bs4', 'BeautifulSoup', 'lxml', 'API', 'web scraping'])
-            libraries = st.multiselect(label='Libraries',
-                                       options=['Numpy', 'Pandas', 'Matplotlib', 'Seaborn', 'Plotly', 'OpenCV'])
-            database_management = st.multiselect(label='Database Management', options=['MySQL', 'MS SQL Server'])
-            business_intelligence = st.multiselect(label='Business Intelligence',
-                                                   options=['Power BI', 'DAX', 'Power Query', 'Tableau', 'Zoho',
-                                                            'Quicksight', 'Google Studio', 'Excel Reporting'])
-            data_engineering = st.multiselect(label='Data Engineering',
-                                              options=['ETL Tools', 'SSIS', 'Data Warehouse', 'Data Pipeline',
-                                                       'Data Mining', 'Data Wrangling', 'Data Munging'])
-            cloud_platforms = st.multiselect(label='Cloud Platform',
-                                             options=['Microsoft Azure', 'Azure Data Factory', 'Azure Cloud Services',
-                                                      'Azure SQL Database', 'AWS', 'GCP'])
-            big_data = st.multiselect(label='Big Data Tools', options=['Apache Spark', 'PySpark', 'Databricks'])
-            machine_learning = st.multiselect(label='Machine Learning', options=['Scikit-learn'])
+            # Categories the taxonomy leaves out stay empty
+            skills = {field: [] for field in SKILL_FIELDS}
+            for category in taxonomy.categories:
+                skills[category['id']] = st.multiselect(label=category['form_label'],
+                                                        options=skill_options(taxonomy, category['id'], skill_query),
+                                                        key=category['id'])
         experience_details = []
-        exp = int(st.number_input('Experience Count : ',step=1))+1
+        exp = int(st.number_input('Experience Count : ',step=1, key='experience_count'))+1
         for i in range(1, exp):  # Allows for up to 3 experiences
             with st.expander(f'Professional Experience {i}'):
                 profile = st.text_input(f'Profile {i}', key=f'profile_{i}')
@@ -224,36 +778,35 @@ def main():
                 end_date = st.date_input(f"End Date {i}", key=f'end_date_{i}')
                 is_current_job = st.checkbox(f"Currently Working Here {i}", key=f'current_{i}')
                 jd = st.text_area(f'Job Description {i}', key=f'jd_{i}')
-                if profile and company_name and jd:  # Simple validation to check if at least these fields are filled
+                # Experiences left blank are skipped; ResumeSpec checks the ones that were started
+                if profile.strip() or company_name.strip() or jd.strip():
                     experience_details.append((profile, company_name, start_date, end_date, is_current_job, jd))
         with st.expander('Education'):
-            degree = st.text_input('Education')
-            university = st.text_input('University')
-            certifications = st.text_area('Certifications')
-            additional_skills = st.text_area('Additional Skills')
+            degree = st.text_input('Education', key='degree')
+            university = st.text_input('University', key='university')
+            certifications = st.text_area('Certifications', key='certifications')
+            additional_skills = st.text_area('Additional Skills', key='additional_skills')
+        labels = template_labels(os.path.getmtime(TEMPLATE_DIR))
+        template = labels[st.selectbox('Template', list(labels), key='template')]
 
         submitted = st.form_submit_button("Generate Resume")
 
-    if submitted:
-        # Call the function to generate resume
-        # Make sure to pass all collected information to the function
-        file_path = generate_resume(name, city, area_name, zipcode, email, phone, linkedin, summary,
-                    programming_languages, libraries, business_intelligence, data_engineering,
-                    big_data,
-                    degree, university, certifications, additional_skills, statistical_methods,
-                    data_collection, database_management, cloud_platforms, machine_learning,
-                    *experience_details)
-
-        st.session_state['resume_path'] = file_path  # Store the path in session state
-
-    # Check if the resume has been generated and offer a download button
-    if 'resume_path' in st.session_state:
-        with open(st.session_state['resume_path'], 'rb') as file:
-            st.download_button(label="Download Resume", data=file, file_name="resume.docx",
-                               mime='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+    # Call the function to generate resume
+    # Make sure to pass all collected information to the function
+    resume_inputs = (name, city, area_name, zipcode, email, phone, linkedin, summary,
+                     skills['programming_languages'], skills['libraries'], skills['business_intelligence'],
+                     skills['data_engineering'], skills['big_data'],
+                     degree, university, certifications, additional_skills, skills['statistical_methods'],
+                     skills['data_collection'], skills['database_management'], skills['cloud_platforms'],
+                     skills['machine_learning'], *experience_details)
+    return submitted, template, resume_inputs
+
 
 if __name__ == '__main__':
-    main()
+    # `streamlit run` re-executes this file on every rerun, which would rebuild this module's caches (document
+    # prototypes, row fragments, the render cache) each time; running main from the imported module keeps them
+    import resume_generator
+    resume_generator.main(IMPORT_SECONDS)
 
 
 
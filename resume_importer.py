@@ -0,0 +1,381 @@
+"""Imports existing .docx resumes back into the fields generate_resume takes.
+
+``word/document.xml`` is streamed with incremental XML parsing, one paragraph at a time, so
+no python-docx object is built. The section headings written by generate_resume (SUMMARY,
+TECHNICAL SKILLS, PROFESSIONAL EXPERIENCE, ...) split the text back into the form's fields;
+the headings, experience lines and education lines of every bundled resume_template are
+recognised. The result is a record in the format bulk_generate reads.
+
+    python resume_importer.py old_resumes/ --output cohort.jsonl --workers 4
+    python resume_importer.py old_resumes.zip --output cohort.jsonl
+"""
+import argparse
+import json
+import os
+import re
+import string
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+from lxml import etree
+
+from resume_template import FORMAT, SKILLS, TEMPLATE_DIR, instruction_fields, list_templates, load_template
+from skill_taxonomy import load_taxonomy
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+HEADINGS = {'SUMMARY': 'summary', 'PROFESSIONAL SUMMARY': 'summary',
+            'TECHNICAL SKILLS': 'technical_skills', 'SKILLS': 'technical_skills',
+            'PROFESSIONAL EXPERIENCE': 'experience', 'EXPERIENCE': 'experience', 'WORK EXPERIENCE': 'experience',
+            'EDUCATION': 'education', 'CERTIFICATIONS': 'certifications',
+            'ADDITIONAL SKILLS': 'additional_skills'}
+TEXT_FIELDS = ['name', 'city', 'area_name', 'zipcode', 'email', 'phone', 'linkedin', 'summary',
+               'degree', 'university', 'certifications', 'additional_skills']
+BULLET = re.compile(r'^\s*[•\-–*]\s*')
+EXPERIENCE_LINE = re.compile(r'^(?P<profile>.+?) at (?P<company_name>.+) \((?P<start>[A-Za-z]+\.? \d{4}) - '
+                             r'(?P<end>Present|[A-Za-z]+\.? \d{4})\)$', re.IGNORECASE)
+# The section a template's section is read back into, by a field its rows write
+FIELD_SECTIONS = {'summary': 'summary', 'degree': 'education', 'university': 'education',
+                  'certifications': 'certifications', 'additional_skills': 'additional_skills'}
+PHONE = re.compile(r'^\+?[\d\s().-]{6,}$')
+REPORT_EVERY = 500
+
+
+# Function to open word/document.xml of a .docx given as a path, bytes or a binary file object
+def open_document_xml(source):
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    package = zipfile.ZipFile(source)
+    try:
+        return package, package.open('word/document.xml')
+    except KeyError:
+        package.close()
+        raise ValueError('not a Word document: word/document.xml is missing') from None
+
+
+def iter_paragraphs(source):
+    """Yields the text of every paragraph in document order, streaming document.xml.
+
+    Line breaks inside a paragraph come back as '\\n' and tabs as '\\t'. Each paragraph is
+    dropped from the tree once read, so memory stays flat however long the document is.
+    """
+    package, document = open_document_xml(source)
+    with package, document:
+        for _, paragraph in etree.iterparse(document, events=('end',), tag=f'{W}p', huge_tree=True):
+            parts = []
+            for element in paragraph.iter(f'{W}t', f'{W}tab', f'{W}br', f'{W}cr'):
+                if element.tag == f'{W}t':
+                    parts.append(element.text or '')
+                elif element.tag == f'{W}tab':
+                    parts.append('\t')
+                else:
+                    parts.append('\n')
+            yield ''.join(parts)
+            # Free what has been read: the paragraph, then the finished siblings of it and of every ancestor
+            # (earlier table rows and cells). A text box's paragraphs are cleared before their enclosing
+            # paragraph, which is still being read, so above them only the text box's own siblings go
+            paragraph.clear(keep_tail=True)
+            nested = next(paragraph.iterancestors(f'{W}p'), None) is not None
+            for node in [paragraph] if nested else [paragraph, *paragraph.iterancestors()]:
+                parent = node.getparent()
+                if parent is None:
+                    break
+                while node.getprevious() is not None:
+                    del parent[0]
+
+
+# Function to drop the bullet generate_resume puts in front of list items
+def strip_bullet(line):
+    return BULLET.sub('', line, count=1).strip()
+
+
+# Function to read a 'January 2020' style month into an ISO date (first of the month)
+def parse_month(text):
+    text = text.replace('.', '').strip()
+    for pattern in ('%B %Y', '%b %Y'):
+        try:
+            return datetime.strptime(text, pattern).date().isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f'unrecognised date {text!r}')
+
+
+# Function to tell which of the importer's sections a template section writes, or None
+def section_kind(each, instructions):
+    if each:
+        return 'experience'
+    for kind, operand, _ in instructions:
+        if kind == SKILLS:
+            return 'technical_skills'
+        for field in instruction_fields(kind, operand):
+            if field in FIELD_SECTIONS:
+                return FIELD_SECTIONS[field]
+    return None
+
+
+# Function to turn a row's str.format pattern into an anchored regex with a named group per field
+def pattern_regex(pattern):
+    parts, seen = ['^'], set()
+    for literal, name, _, _ in string.Formatter().parse(pattern):
+        parts.append(re.escape(literal))
+        if name is not None:
+            parts.append(f'(?P={name})' if name in seen else f'(?P<{name}>.*?)')
+            seen.add(name)
+    return re.compile(''.join(parts) + '$')
+
+
+@lru_cache(maxsize=8)
+def template_rules(modified):
+    """Returns (headings, experience rules, education regexes) learnt from the bundled templates.
+
+    ``headings`` extends HEADINGS with every template heading. An experience rule is (regex,
+    date format, current label) for a row writing profile, company_name, start and end.
+    ``modified`` is TEMPLATE_DIR's mtime, so edited templates are picked up.
+    """
+    headings = dict(HEADINGS)
+    experience_rules, education_patterns = [], []
+    for name in list_templates():
+        try:
+            template = load_template(name)
+        except ValueError:
+            continue
+        for _, each, heading_row, instructions in template.sections:
+            section = section_kind(each, instructions)
+            if section is None:
+                continue
+            if heading_row:
+                headings.setdefault(heading_row[0].strip().rstrip(':').upper(), section)
+            for kind, operand, _ in instructions:
+                if kind != FORMAT:
+                    continue
+                fields = set(instruction_fields(kind, operand))
+                if section == 'experience' and {'profile', 'company_name', 'start', 'end'} <= fields:
+                    rule = (pattern_regex(operand), template.date_format, template.current_label)
+                    if rule not in experience_rules:
+                        experience_rules.append(rule)
+                elif section == 'education' and {'degree', 'university'} <= fields:
+                    regex = pattern_regex(operand)
+                    if regex not in education_patterns:
+                        education_patterns.append(regex)
+    return headings, experience_rules, education_patterns
+
+
+# Function to read a template's experience line into (profile, company, ISO start, ISO end or None), or None
+def match_experience(line, experience_rules):
+    for regex, date_format, current_label in experience_rules:
+        match = regex.match(line)
+        if not match or not match['profile'] or not match['company_name']:
+            continue
+        try:
+            start = datetime.strptime(match['start'], date_format).date().isoformat()
+            end = (None if match['end'] == current_label
+                   else datetime.strptime(match['end'], date_format).date().isoformat())
+        except ValueError:
+            continue  # A job description line that happens to look like the row
+        return match['profile'], match['company_name'], start, end
+    match = EXPERIENCE_LINE.match(line)
+    if not match:
+        return None
+    end = None if match['end'].lower() == 'present' else parse_month(match['end'])
+    return match['profile'], match['company_name'], parse_month(match['start']), end
+
+
+# Function to split the 'city, area, zip | email | phone | linkedin' header line
+def parse_contact(line, record):
+    parts = [part.strip() for part in line.split('|')]
+    if len(parts) == 4 and parts[0].count(',') >= 2:
+        # Exactly the layout resume_sections writes
+        record['email'], record['phone'], record['linkedin'] = parts[1:]
+        parts = parts[:1]
+    for part in parts:
+        if not part:
+            continue
+        if '@' in part and not record['email']:
+            record['email'] = part
+        elif 'linkedin' in part.lower() or part.lower().startswith('http'):
+            record['linkedin'] = record['linkedin'] or part
+        elif PHONE.match(part) and not record['phone']:
+            record['phone'] = part
+        elif not record['city']:
+            location = [piece.strip() for piece in part.split(',')]
+            record['city'] = location[0]
+            if len(location) > 1:
+                record['zipcode'] = location[-1] if len(location) > 2 or location[-1].isdigit() else ''
+                record['area_name'] = ', '.join(location[1:-1] if record['zipcode'] else location[1:])
+
+
+# Function to map the lines of each section onto the record; ``rules`` is template_rules' result
+def fill_section(record, section, lines, rules):
+    if section == 'header':
+        if lines:
+            record['name'] = lines[0]
+        for line in lines[1:]:
+            if '|' in line or '@' in line:
+                parse_contact(line, record)
+    elif section == 'summary':
+        record['summary'] = '\n'.join(lines)
+    elif section == 'technical_skills':
+        # The bullet labels are the taxonomy's category labels, as written by resume_sections
+        taxonomy = load_taxonomy()
+        fields = {category['label']: category['id'] for category in taxonomy.categories}
+        for line in lines:
+            label, _, values = strip_bullet(line).partition(':')
+            field = fields.get(label.strip())
+            if field:
+                record[field] = taxonomy.canonicalize(value.strip() for value in values.split(',') if value.strip())
+    elif section == 'experience':
+        record['experience_details'] = parse_experiences(lines, rules[1])
+    elif section == 'education':
+        text = ' '.join(lines)
+        for regex in rules[2]:
+            match = regex.match(text)
+            if match:
+                record['degree'], record['university'] = match['degree'], match['university']
+                break
+        else:
+            degree, separator, university = text.rpartition(' from ')
+            record['degree'], record['university'] = (degree, university) if separator else (text, '')
+    elif section in ('certifications', 'additional_skills'):
+        record[section] = '\n'.join(strip_bullet(line) for line in lines)
+
+
+# Function to rebuild experience records from the 'profile at company (start - end)' style lines
+def parse_experiences(lines, experience_rules=()):
+    experiences = []
+    jd_lines = []
+    for line in lines:
+        match = match_experience(line, experience_rules)
+        if not match:
+            jd_lines.append(strip_bullet(line))
+            continue
+        profile, company_name, start_date, end_date = match
+        # The company row written above each entry is not part of the previous job description
+        if jd_lines and jd_lines[-1] == company_name:
+            jd_lines.pop()
+        if experiences:
+            experiences[-1]['jd'] = '\n'.join(jd_lines)
+        jd_lines = []
+        experiences.append({'profile': profile, 'company_name': company_name, 'start_date': start_date,
+                            'end_date': end_date, 'is_current_job': end_date is None, 'jd': ''})
+    if experiences:
+        experiences[-1]['jd'] = '\n'.join(jd_lines)
+    return experiences
+
+
+def import_resume(source):
+    """Reads a .docx (path, bytes or binary file object) into a bulk_generate style record.
+
+    Raises ValueError when the file is not a Word document or has no recognisable content.
+    """
+    record = dict.fromkeys(TEXT_FIELDS, '')
+    record.update({category['id']: [] for category in load_taxonomy().categories})
+    record['experience_details'] = []
+    rules = template_rules(os.path.getmtime(TEMPLATE_DIR))
+    section, lines = 'header', []
+    try:
+        for text in iter_paragraphs(source):
+            heading = rules[0].get(text.strip().rstrip(':').upper())
+            if heading:
+                fill_section(record, section, lines, rules)
+                section, lines = heading, []
+                continue
+            lines.extend(line.strip() for line in text.split('\n') if line.strip())
+    except (zipfile.BadZipFile, etree.XMLSyntaxError) as exc:
+        raise ValueError(f'unreadable document: {exc}') from None
+    fill_section(record, section, lines, rules)
+    if not record['name']:
+        raise ValueError('no resume content found')
+    return record
+
+
+# Function to list (label, path or .docx bytes) for every .docx under a directory or in a ZIP
+def iter_sources(path):
+    if zipfile.is_zipfile(path) and not path.lower().endswith('.docx'):
+        # Members are read here, one at a time, so workers don't each re-read the archive's directory
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.filename.lower().endswith('.docx') and not info.is_dir():
+                    yield info.filename, archive.read(info)
+        return
+    if os.path.isfile(path):
+        yield path, path
+        return
+    for directory, subdirectories, filenames in os.walk(path):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            # Skip Word's '~$' lock files
+            if filename.lower().endswith('.docx') and not filename.startswith('~$'):
+                full_path = os.path.join(directory, filename)
+                yield full_path, full_path
+
+
+def import_bulk(sources, output, workers=None, max_pending=None, report=None, progress=None):
+    """Imports (label, source) pairs into ``output`` as JSONL and returns (imported, failed) counts.
+
+    Each line is the imported record plus a ``source`` field naming the file it came from.
+    Records are written in input order, and at most ``max_pending`` files are in flight at once.
+    """
+    report = report or (lambda label, message: print(f'{label}: {message}', file=sys.stderr))
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 8
+    imported = failed = 0
+    pending = deque()
+
+    def collect(future, label):
+        nonlocal imported, failed
+        try:
+            record = future.result()
+        except Exception as exc:
+            failed += 1
+            report(label, str(exc))
+        else:
+            record['source'] = label
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            imported += 1
+        # Counted on both paths, so failures don't skip a progress line
+        if progress and (imported + failed) % REPORT_EVERY == 0:
+            progress(imported, failed)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for label, source in sources:
+            pending.append((pool.submit(import_resume, source), label))
+            if len(pending) >= max_pending:
+                collect(*pending.popleft())
+        while pending:
+            collect(*pending.popleft())
+    return imported, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import .docx resumes into a JSONL file bulk_generate can read.')
+    parser.add_argument('input', help='a .docx, a directory of .docx files or a ZIP of them')
+    parser.add_argument('--output', '-o', help='JSONL file to write (default: stdout)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def progress(imported, failed):
+        elapsed = time.perf_counter() - started
+        print(f'{imported + failed} resumes read ({(imported + failed) / elapsed:.0f}/s)', file=sys.stderr)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        imported, failed = import_bulk(iter_sources(args.input), output, workers=args.workers, progress=progress)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+    rate = (imported + failed) / elapsed if elapsed else 0
+    print(f'{imported} resumes imported, {failed} failed in {elapsed:.1f}s ({rate:.0f} resumes/s)',
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Resume data model: one normalized, validated record per candidate.
+
+ResumeSpec holds generate_resume's fields and a tuple of Experience records. Building one trims
+every field, turns Word's manual line and page breaks into line breaks, rejects characters a
+.docx cannot hold, drops empty lines from the bullet fields, checks each experience's dates and
+formats them once, so the renderers only read finished values. Both classes use __slots__ and
+tuples to keep large queues of records small, and serialize to a positional list:
+
+    spec = ResumeSpec.from_args(*generate_resume_args)
+    data = spec.dumps('msgpack')            # or 'json'
+    spec = ResumeSpec.loads(data, 'msgpack')
+
+msgpack is optional (pip install msgpack); JSON always works.
+"""
+import json
+import re
+from datetime import date, datetime
+
+# The skill-list parameters of generate_resume; the taxonomy's categories must be among them
+SKILL_FIELDS = ('programming_languages', 'libraries', 'business_intelligence', 'data_engineering', 'big_data',
+                'statistical_methods', 'data_collection', 'database_management', 'cloud_platforms',
+                'machine_learning')
+# generate_resume's positional fields in order; the experiences follow them
+RESUME_FIELDS = ('name', 'city', 'area_name', 'zipcode', 'email', 'phone', 'linkedin', 'summary',
+                 'programming_languages', 'libraries', 'business_intelligence', 'data_engineering', 'big_data',
+                 'degree', 'university', 'certifications', 'additional_skills', 'statistical_methods',
+                 'data_collection', 'database_management', 'cloud_platforms', 'machine_learning')
+# Multi-line fields written one bullet per line
+BULLET_FIELDS = ('certifications', 'additional_skills')
+SERIAL_FORMATS = ('json', 'msgpack')
+SPEC_VERSION = 1
+
+
+# Word's manual line break and page break, common in text pasted from a .docx, become line breaks
+LINE_BREAKS = str.maketrans('\x0b\x0c', '\n\n')
+# Characters XML 1.0 cannot hold, so no .docx can contain them
+INVALID_TEXT = re.compile('[\x00-\x08\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+# Function to turn a value into text a .docx can hold, rejecting characters it cannot
+def valid_text(value, field):
+    text = str(value).translate(LINE_BREAKS)
+    invalid = INVALID_TEXT.search(text)
+    if invalid:
+        raise ValueError(f'{field} contains the unsupported character U+{ord(invalid.group()):04X}')
+    return text
+
+
+# Function to trim a single-line field
+def clean_text(value, field='text'):
+    return '' if value is None else valid_text(value, field).strip()
+
+
+# Function to trim every line of a multi-line field and drop the empty ones
+def clean_lines(value, field='text'):
+    if value is None:
+        return ''
+    return '\n'.join(line for line in (line.strip() for line in valid_text(value, field).split('\n')) if line)
+
+
+# Function to trim a skill list into a tuple without empty entries
+def clean_list(value, field='skills'):
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        raise ValueError(f'{field} must be a list, not a string')
+    return tuple(item for item in (valid_text(item, field).strip() for item in value) if item)
+
+
+# Function to read a date given as a date, a datetime (its time is dropped) or an ISO string
+def to_date(value, field):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f'{field} must be a date (YYYY-MM-DD), got {value!r}') from None
+
+
+class Experience:
+    """One job, normalized: trimmed text, one bullet per line of ``jd`` and checked dates.
+
+    ``end_date`` is only required (and checked to be on or after ``start_date``) when the job
+    is not current. The formatted period is kept for the last date format asked for.
+    """
+
+    __slots__ = ('profile', 'company_name', 'start_date', 'end_date', 'is_current_job', 'jd', '_period')
+
+    def __init__(self, profile, company_name, start_date, end_date=None, is_current_job=False, jd=''):
+        self.profile = clean_text(profile, 'profile')
+        self.company_name = clean_text(company_name, 'company_name')
+        self.jd = clean_lines(jd, 'jd')
+        self.is_current_job = bool(is_current_job)
+        missing = [field for field in ('profile', 'company_name', 'jd') if not getattr(self, field)]
+        if start_date is None or start_date == '':
+            missing.append('start_date')
+        if not self.is_current_job and (end_date is None or end_date == ''):
+            missing.append('end_date')
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        self.start_date = to_date(start_date, 'start_date')
+        self.end_date = None if end_date is None or end_date == '' else to_date(end_date, 'end_date')
+        if not self.is_current_job and self.end_date < self.start_date:
+            raise ValueError(f'end_date {self.end_date} is before start_date {self.start_date}')
+        self._period = None
+        self.period()
+
+    def period(self, date_format='%B %Y', current_label='Present'):
+        """Returns the (start, end) strings of the job in ``date_format``."""
+        cached = self._period
+        if cached is None or cached[0] != date_format or cached[1] != current_label:
+            end = current_label if self.is_current_job else self.end_date.strftime(date_format)
+            cached = self._period = (date_format, current_label, self.start_date.strftime(date_format), end)
+        return cached[2], cached[3]
+
+    def fields(self, date_format='%B %Y', current_label='Present'):
+        """The values a template's experience rows are formatted with."""
+        start, end = self.period(date_format, current_label)
+        return {'profile': self.profile, 'company_name': self.company_name, 'start': start, 'end': end,
+                'jd': self.jd}
+
+    def to_list(self):
+        return [self.profile, self.company_name, self.start_date.isoformat(),
+                self.end_date.isoformat() if self.end_date else None, self.is_current_job, self.jd]
+
+    def __eq__(self, other):
+        return isinstance(other, Experience) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return f'Experience({self.profile!r}, {self.company_name!r}, {self.start_date!r}, {self.end_date!r})'
+
+
+class ResumeSpec:
+    """A candidate's resume fields after one normalization and validation pass.
+
+    Text fields are trimmed strings, bullet fields keep one non-empty line per bullet, skill
+    fields are tuples and ``experiences`` is a tuple of Experience. Bad input raises ValueError.
+    """
+
+    __slots__ = RESUME_FIELDS + ('experiences',)
+
+    def __init__(self, experiences=(), **fields):
+        unknown = sorted(set(fields) - set(RESUME_FIELDS))
+        if unknown:
+            raise TypeError(f"unknown resume fields: {', '.join(unknown)}")
+        for field in RESUME_FIELDS:
+            value = fields.get(field)
+            if field in SKILL_FIELDS:
+                value = clean_list(value, field)
+            elif field in BULLET_FIELDS:
+                value = clean_lines(value, field)
+            else:
+                value = clean_text(value, field)
+            setattr(self, field, value)
+        if not self.name:
+            raise ValueError('name is required')
+        self.experiences = tuple(experience_from(experience, index)
+                                 for index, experience in enumerate(experiences, 1))
+
+    @classmethod
+    def from_args(cls, *args):
+        """Builds a spec from generate_resume's positional arguments."""
+        if len(args) < len(RESUME_FIELDS):
+            raise TypeError(f'expected at least {len(RESUME_FIELDS)} resume fields, got {len(args)}')
+        return cls(args[len(RESUME_FIELDS):], **dict(zip(RESUME_FIELDS, args)))
+
+    def fields(self):
+        """The values a template's rows are formatted with, by field name."""
+        return {field: getattr(self, field) for field in RESUME_FIELDS}
+
+    def to_record(self):
+        """The spec as a named, JSON-ready record in bulk_generate's input format."""
+        record = {field: list(value) if field in SKILL_FIELDS else value for field, value in self.fields().items()}
+        record['experience_details'] = [dict(zip(('profile', 'company_name', 'start_date', 'end_date',
+                                                  'is_current_job', 'jd'), experience.to_list()))
+                                        for experience in self.experiences]
+        return record
+
+    def to_list(self):
+        """The compact form: a version followed by the fields in order, then the experiences."""
+        values = [list(value) if field in SKILL_FIELDS else value for field, value in self.fields().items()]
+        return [SPEC_VERSION, *values, [experience.to_list() for experience in self.experiences]]
+
+    @classmethod
+    def from_list(cls, data):
+        """Inverse of to_list; the data is validated again, so it can come from anywhere."""
+        if not isinstance(data, (list, tuple)) or len(data) != len(RESUME_FIELDS) + 2 or data[0] != SPEC_VERSION:
+            raise ValueError(f'not a version {SPEC_VERSION} resume spec')
+        experiences = data[-1]
+        if not isinstance(experiences, (list, tuple)):
+            raise ValueError('experiences must be a list')
+        return cls(experiences, **dict(zip(RESUME_FIELDS, data[1:-1])))
+
+    def dumps(self, serial_format='json'):
+        """Serializes the compact form to bytes as JSON or msgpack."""
+        if serial_format == 'msgpack':
+            return _msgpack().packb(self.to_list())
+        if serial_format != 'json':
+            raise ValueError(f'unknown serial format {serial_format!r}')
+        return json.dumps(self.to_list(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def loads(cls, data, serial_format='json'):
+        """Reads a spec written by dumps."""
+        if serial_format == 'msgpack':
+            return cls.from_list(_msgpack().unpackb(data))
+        if serial_format != 'json':
+            raise ValueError(f'unknown serial format {serial_format!r}')
+        return cls.from_list(json.loads(data))
+
+    # Pickled as the compact form, so specs sent to worker processes stay small
+    def __reduce__(self):
+        return ResumeSpec.from_list, (self.to_list(),)
+
+    def __eq__(self, other):
+        return isinstance(other, ResumeSpec) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return f'ResumeSpec(name={self.name!r}, experiences={len(self.experiences)})'
+
+
+# Function to build an Experience from an Experience or generate_resume's 6-item tuple
+def experience_from(experience, index):
+    if isinstance(experience, Experience):
+        return experience
+    if not isinstance(experience, (list, tuple)) or len(experience) != 6:
+        raise ValueError(f'experience {index} must have profile, company_name, start_date, end_date, '
+                         f'is_current_job and jd')
+    try:
+        return Experience(*experience)
+    except ValueError as exc:
+        raise ValueError(f'experience {index}: {exc}') from None
+
+
+def to_spec(inputs):
+    """Returns the ResumeSpec for generate_resume's positional arguments, or the spec passed alone."""
+    if len(inputs) == 1 and isinstance(inputs[0], ResumeSpec):
+        return inputs[0]
+    return ResumeSpec.from_args(*inputs)
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ValueError('msgpack serialization needs msgpack (pip install msgpack)') from None
+    return msgpack
@@ -0,0 +1,231 @@
+"""Declarative resume layouts.
+
+A template names the resume's paragraph styles and lists its sections in order. Templates live
+in ``templates/<name>.json``, or .yaml/.yml when PyYAML is installed:
+
+    {"styles": {"ResumeBody": {"name": "Resume Body", "size": 12}, ...},
+     "heading": {"style": "ResumeHeading", "is_heading": true, "align_bottom_left": true, "is_border": true},
+     "sections": [{"id": "summary", "heading": "SUMMARY", "rows": [{"text": "{summary}"}]},
+                  {"id": "experience", "each": "experience", "rows": [{"bullets": "jd"}]}, ...]}
+
+A row is ``text`` (a str.format pattern over a resume_spec.ResumeSpec's text fields), ``bullets``
+(a newline-separated field written as '• ' lines) or ``skills`` (the TECHNICAL SKILLS lines). It
+takes a ``style`` and optional is_heading / align_bottom_left / is_border flags. A section with
+``"each": "experience"`` repeats its rows for every experience, with the fields profile,
+company_name, start, end and jd.
+
+compile_template turns a template into a CompiledTemplate once per content hash. Every
+formatting dict and constant row is built then and shared by all renders.
+"""
+import hashlib
+import json
+import os
+import string
+from functools import lru_cache
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+DEFAULT_TEMPLATE = 'data_analyst'
+TEMPLATE_EXTENSIONS = ('.json', '.yaml', '.yml')
+TEXT_FIELDS = frozenset(['name', 'city', 'area_name', 'zipcode', 'email', 'phone', 'linkedin', 'summary',
+                         'degree', 'university', 'certifications', 'additional_skills'])
+EXPERIENCE_FIELDS = frozenset(['profile', 'company_name', 'start', 'end', 'jd'])
+FORMATTING_FLAGS = ('is_heading', 'align_bottom_left', 'is_border')
+DEFAULT_HEADING = {'style': 'ResumeHeading', 'is_heading': True, 'align_bottom_left': True, 'is_border': True}
+
+# Instruction kinds of a compiled row
+ROW, FIELD, FORMAT, BULLETS, SKILLS = range(5)
+
+
+class CompiledTemplate:
+    """A template compiled into per-section instruction lists.
+
+    ``sections`` holds (section id, repeats per experience, heading row or None, instructions).
+    Each instruction is (kind, operand, formatting). A ROW instruction carries a finished
+    (text, formatting) row, and the others fill in their text from the resume's fields.
+    """
+
+    def __init__(self, spec, digest):
+        self.digest = digest
+        self.name = spec.get('name') or digest[:12]
+        self.date_format = spec.get('date_format', '%B %Y')
+        self.current_label = spec.get('current_label', 'Present')
+        self.styles = compile_styles(spec.get('styles'))
+        style_ids = {style_id for style_id, _ in self.styles}
+        heading = compile_formatting(spec.get('heading', DEFAULT_HEADING), style_ids)
+        self.sections = []
+        seen = set()
+        for section in spec.get('sections') or []:
+            section_id = section.get('id')
+            if not section_id or section_id in seen:
+                raise ValueError(f'template {self.name}: every section needs a unique id, got {section_id!r}')
+            seen.add(section_id)
+            each = section.get('each')
+            if each not in (None, 'experience'):
+                raise ValueError(f'template {self.name}: section {section_id} can only repeat per experience')
+            fields = EXPERIENCE_FIELDS if each else TEXT_FIELDS
+            heading_row = (section['heading'], heading) if section.get('heading') else None
+            instructions = [compile_row(row, fields, style_ids, f'template {self.name} section {section_id}')
+                            for row in section.get('rows', [])]
+            self.sections.append((section_id, bool(each), heading_row, instructions))
+        if not self.sections:
+            raise ValueError(f'template {self.name} has no sections')
+
+    def layout(self, spec, taxonomy):
+        """Lays a resume_spec.ResumeSpec out as (section id, rows) pairs."""
+        fields = spec.fields()
+        sections = []
+        for section_id, each, heading_row, instructions in self.sections:
+            rows = [heading_row] if heading_row else []
+            if not each:
+                sections.append((section_id, rows + run_instructions(instructions, fields, taxonomy)))
+                continue
+            sections.append((section_id, rows))
+            for idx, experience in enumerate(spec.experiences, 1):
+                values = experience.fields(self.date_format, self.current_label)
+                sections.append((f'{section_id}:{idx}', run_instructions(instructions, values, taxonomy)))
+        return sections
+
+
+# Function to execute one section's instructions against its field values
+def run_instructions(instructions, values, taxonomy):
+    rows = []
+    for kind, operand, formatting in instructions:
+        if kind == ROW:
+            rows.append(operand)
+        elif kind == FIELD:
+            rows.append((values[operand], formatting))
+        elif kind == FORMAT:
+            rows.append((operand.format_map(values), formatting))
+        elif kind == BULLETS:
+            # Bullet fields arrive normalized by ResumeSpec: one trimmed, non-empty line per bullet
+            text = values[operand]
+            rows.append(('• ' + text.replace('\n', '\n• ') if text else '', formatting))
+        else:
+            # Category labels and order come from the skill taxonomy; synonyms are mapped to canonical names
+            skill_lines = [f"• {category['label']}: {', '.join(taxonomy.canonicalize(values[category['id']]))}"
+                           for category in taxonomy.categories]
+            rows.append(('\n'.join(skill_lines), formatting))
+    return rows
+
+
+# Function to list the fields a compiled instruction writes
+def instruction_fields(kind, operand):
+    if kind in (FIELD, BULLETS):
+        return [operand]
+    if kind == FORMAT:
+        return [name for _, name, _, _ in string.Formatter().parse(operand) if name is not None]
+    return []
+
+
+# Function to turn the template's styles into hashable (style ID, (name, bold, size, coloured, centered)) pairs
+def compile_styles(styles):
+    if not styles:
+        raise ValueError('template defines no styles')
+    names = set()
+    for style_id, style in styles.items():
+        # Rows reference styles by ID in the XML, so an ID must be a single word
+        if not style_id or any(char.isspace() for char in style_id):
+            raise ValueError(f'style ID {style_id!r} must be a non-empty word without spaces')
+        name = style.get('name') or style_id
+        if name in names:
+            raise ValueError(f'style name {name!r} is used by more than one style')
+        names.add(name)
+    # Kept in template order: styles are registered in this order, which fixes the bytes of styles.xml
+    return tuple((style_id, (style.get('name') or style_id, bool(style.get('bold')), style.get('size', 11),
+                             bool(style.get('colored')), bool(style.get('centered'))))
+                 for style_id, style in styles.items())
+
+
+# Function to build the formatting dict of a row: its style plus the flags it sets
+def compile_formatting(row, style_ids, where='heading'):
+    style = row.get('style', 'ResumeBody')
+    if style not in style_ids:
+        raise ValueError(f'{where}: unknown style {style!r}')
+    formatting = {'style': style}
+    for flag in FORMATTING_FLAGS:
+        if flag in row:
+            formatting[flag] = bool(row[flag])
+    return formatting
+
+
+# Function to compile one row of a section into an instruction
+def compile_row(row, fields, style_ids, where):
+    formatting = compile_formatting(row, style_ids, where)
+    if row.get('skills'):
+        return SKILLS, None, formatting
+    if 'bullets' in row:
+        if row['bullets'] not in fields:
+            raise ValueError(f"{where}: unknown field {row['bullets']!r}")
+        return BULLETS, row['bullets'], formatting
+    pattern = row.get('text')
+    if pattern is None:
+        raise ValueError(f'{where}: a row needs text, bullets or skills')
+    names = [name for _, name, _, _ in string.Formatter().parse(pattern) if name is not None]
+    unknown = [name for name in names if name not in fields]
+    if unknown:
+        raise ValueError(f"{where}: unknown field {unknown[0]!r} in {pattern!r}")
+    if not names:
+        return ROW, (pattern.replace('{{', '{').replace('}}', '}'), formatting), formatting
+    if pattern == '{' + names[0] + '}':
+        return FIELD, names[0], formatting
+    return FORMAT, pattern, formatting
+
+
+@lru_cache(maxsize=32)
+def _compile(canonical):
+    return CompiledTemplate(json.loads(canonical), hashlib.sha256(canonical.encode('utf-8')).hexdigest())
+
+
+def compile_template(spec):
+    """Returns the CompiledTemplate of a template dict, compiled once per content hash."""
+    # Key order is kept in the hashed form since style order changes the output
+    return _compile(json.dumps(spec, ensure_ascii=False, separators=(',', ':')))
+
+
+# Function to read a template file as a dict
+def read_template(path):
+    with open(path, encoding='utf-8') as file:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(f'{path}: reading YAML templates needs PyYAML (pip install pyyaml)') from None
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+@lru_cache(maxsize=32)
+def _load(path, mtime):
+    return compile_template(read_template(path))
+
+
+# Function to find a template file by name (in TEMPLATE_DIR) or path
+def template_path(template):
+    if os.path.isfile(template):
+        return os.path.abspath(template)
+    for extension in TEMPLATE_EXTENSIONS:
+        path = os.path.join(TEMPLATE_DIR, template + extension)
+        if os.path.isfile(path):
+            return path
+    raise ValueError(f'no resume template named {template!r}')
+
+
+def load_template(template=None):
+    """Returns a CompiledTemplate for a template name, file path, dict or CompiledTemplate.
+
+    With no template, RESUME_TEMPLATE or the Data Analyst template is used. Files are
+    compiled once and reused until they change.
+    """
+    if isinstance(template, CompiledTemplate):
+        return template
+    if isinstance(template, dict):
+        return compile_template(template)
+    path = template_path(template or os.environ.get('RESUME_TEMPLATE') or DEFAULT_TEMPLATE)
+    return _load(path, os.path.getmtime(path))
+
+
+def list_templates():
+    """Names of the templates in TEMPLATE_DIR, default first."""
+    names = sorted({os.path.splitext(filename)[0] for filename in os.listdir(TEMPLATE_DIR)
+                    if filename.endswith(TEMPLATE_EXTENSIONS)})
+    return sorted(names, key=lambda name: name != DEFAULT_TEMPLATE)
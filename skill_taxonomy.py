@@ -0,0 +1,188 @@
+"""Skill taxonomy: the categories of the TECHNICAL SKILLS section and the skills (with synonyms) in each.
+
+The taxonomy is a JSON file (``skill_taxonomy.json`` next to this module, or the file named by
+``RESUME_TAXONOMY``) listing categories in resume order:
+
+    {"categories": [{"id": "big_data", "label": "Big Data Tools", "form_label": "Big Data Tools",
+                     "skills": ["Databricks", {"name": "PySpark", "synonyms": ["Spark (Python)"]}]}]}
+
+``id`` is the generate_resume parameter the category fills, ``label`` is printed on the resume
+and ``form_label`` is shown in the Streamlit form. load_taxonomy compiles the file into a
+SkillIndex once per file version.
+"""
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from functools import lru_cache
+
+DEFAULT_TAXONOMY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.json')
+
+
+# Fuzzy matching indexes delete variants of at most this many leading characters, bounding memory per alias
+FUZZY_PREFIX = 8
+
+
+# Function to fold case and whitespace so lookups ignore both
+def normalize(text):
+    return ' '.join(str(text).casefold().split())
+
+
+# Function to list every string one character deletion away from text (plus text itself)
+def deletes(text):
+    return {text} | {text[:i] + text[i + 1:] for i in range(len(text))}
+
+
+# Function to tell whether a and b differ by at most one insertion, deletion, substitution or transposition
+def within_one_edit(a, b):
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return shorter[i:] == longer[i + 1:]
+
+
+class SkillIndex:
+    """Compiled taxonomy: canonical names, a synonym map and sorted arrays for prefix search.
+
+    Every alias (a skill's name or synonym) is also indexed from each of its word starts, so
+    'spark' finds 'Apache Spark'. Fuzzy search uses a delete-variant map built on first use.
+    """
+
+    def __init__(self, categories, digest=None):
+        # A hash of the taxonomy's content, so renders cached under one version are not served for another
+        self.digest = digest
+        self.categories = []
+        self.aliases = {}
+        self.category_of = {}
+        self.skills_by_category = {}
+        entries = {None: []}
+        for category in categories:
+            category_id = category['id']
+            if category_id in self.skills_by_category:
+                raise ValueError(f'category {category_id!r} is defined twice')
+            label = category.get('label') or category_id.replace('_', ' ').title()
+            self.categories.append({'id': category_id, 'label': label,
+                                    'form_label': category.get('form_label') or label})
+            skills = self.skills_by_category[category_id] = []
+            entries[category_id] = []
+            for skill in category.get('skills', []):
+                if isinstance(skill, str):
+                    skill = {'name': skill}
+                name = skill['name'].strip()
+                if name in self.category_of:
+                    raise ValueError(f'skill {name!r} is listed twice')
+                skills.append(name)
+                self.category_of[name] = category_id
+                # A skill's own name wins over another skill's synonym
+                self.aliases[normalize(name)] = name
+                for alias in [name] + list(skill.get('synonyms', [])):
+                    alias = normalize(alias)
+                    self.aliases.setdefault(alias, name)
+                    words = alias.split(' ')
+                    for start in range(len(words)):
+                        entry = (' '.join(words[start:]), start, name)
+                        entries[None].append(entry)
+                        entries[category_id].append(entry)
+        # Sorted (key, word offset, name) triples; parallel key lists keep bisect on plain strings
+        self._sorted = {}
+        for category_id, category_entries in entries.items():
+            category_entries.sort()
+            self._sorted[category_id] = ([key for key, _, _ in category_entries],
+                                         [name for _, _, name in category_entries])
+        self._fuzzy = None
+
+    def __len__(self):
+        return len(self.category_of)
+
+    def canonical(self, skill):
+        """Returns the canonical name of a skill or synonym, or None if the taxonomy does not know it."""
+        return self.aliases.get(normalize(skill))
+
+    def canonicalize(self, skills):
+        """Maps each skill to its canonical name, dropping duplicates; unknown skills are kept as typed."""
+        seen = set()
+        result = []
+        for skill in skills:
+            name = self.aliases.get(normalize(skill), skill)
+            if name not in seen:
+                seen.add(name)
+                result.append(name)
+        return result
+
+    def category_skills(self, category_id):
+        return self.skills_by_category.get(category_id, [])
+
+    def prefix_search(self, query, limit=10, category=None):
+        """Returns up to ``limit`` canonical names with an alias word starting with ``query``."""
+        query = normalize(query)
+        keys, names = self._sorted.get(category, ([], []))
+        results = []
+        for position in range(bisect_left(keys, query), len(keys)):
+            if not keys[position].startswith(query) or len(results) >= limit:
+                break
+            if names[position] not in results:
+                results.append(names[position])
+        return results
+
+    def fuzzy_search(self, query, limit=10, category=None):
+        """Returns canonical names with an alias one typo away from ``query``, exact matches first."""
+        query = normalize(query)
+        if self._fuzzy is None:
+            self._fuzzy = self._build_fuzzy()
+        candidates = set()
+        for variant in deletes(query[:FUZZY_PREFIX]):
+            candidates.update(self._fuzzy.get(variant, ()))
+        matches = []
+        for alias in candidates:
+            name = self.aliases[alias]
+            if within_one_edit(query, alias) and (category is None or self.category_of[name] == category):
+                matches.append((alias != query, alias, name))
+        results = []
+        for _, _, name in sorted(matches):
+            if name not in results:
+                results.append(name)
+        return results[:limit]
+
+    def search(self, query, limit=10, category=None):
+        """Prefix matches first, topped up with fuzzy matches for typos."""
+        if not normalize(query):
+            return self.category_skills(category)[:limit] if category else []
+        results = self.prefix_search(query, limit, category)
+        if len(results) < limit:
+            results += [name for name in self.fuzzy_search(query, limit, category) if name not in results]
+        return results[:limit]
+
+    def _build_fuzzy(self):
+        fuzzy = {}
+        for alias in self.aliases:
+            for variant in deletes(alias[:FUZZY_PREFIX]):
+                fuzzy.setdefault(variant, []).append(alias)
+        return fuzzy
+
+
+@lru_cache(maxsize=4)
+def _compile(path, mtime):
+    with open(path, encoding='utf-8') as file:
+        taxonomy = json.load(file)
+    if not isinstance(taxonomy, dict) or not isinstance(taxonomy.get('categories'), list):
+        raise ValueError(f'{path}: expected an object with a "categories" list')
+    canonical = json.dumps(taxonomy['categories'], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return SkillIndex(taxonomy['categories'], hashlib.sha256(canonical.encode('utf-8')).hexdigest())
+
+
+def load_taxonomy(path=None):
+    """Returns the compiled SkillIndex of ``path`` (default: RESUME_TAXONOMY or skill_taxonomy.json).
+
+    The index is compiled once and reused until the file changes.
+    """
+    path = os.path.abspath(path or os.environ.get('RESUME_TAXONOMY') or DEFAULT_TAXONOMY)
+    return _compile(path, os.path.getmtime(path))
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root, next to resume_generator.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import synthetic_candidate  # noqa: E402
+
+
+@pytest.fixture
+def candidate():
+    """generate_resume's positional arguments for a small reproducible candidate."""
+    return synthetic_candidate(experiences=3, jd_lines=4, skills=3)
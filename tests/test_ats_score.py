@@ -0,0 +1,15 @@
+"""Keyword terms come from what each template writes, not from its style names."""
+import pytest
+
+from ats_score import resume_terms
+from resume_spec import ResumeSpec
+from resume_template import list_templates
+
+
+@pytest.mark.parametrize('template_name', list_templates())
+def test_resume_terms_follow_the_template(candidate, template_name):
+    terms = resume_terms(ResumeSpec.from_args(*candidate), template_name)
+    # Job titles and their bullets are keywords under every layout
+    assert 'analyst' in terms
+    # Headings, company names, contact details and dates are not
+    assert not {'experience', 'skills', 'company', 'pune', 'jane', 'january'} & set(terms)
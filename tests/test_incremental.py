@@ -0,0 +1,54 @@
+"""An IncrementalRenderer session renders the same bytes as a full render after every kind of edit."""
+from datetime import date
+
+import pytest
+
+import resume_generator
+from resume_spec import RESUME_FIELDS
+
+SUMMARY = RESUME_FIELDS.index('summary')
+FIELD_COUNT = len(RESUME_FIELDS)
+
+
+# Function to list a session's successive edits as (what changed, arguments, template, sections expected rebuilt)
+def edit_session(candidate):
+    fields, experiences = list(candidate[:FIELD_COUNT]), list(candidate[FIELD_COUNT:])
+    edited = fields[:SUMMARY] + ['Rewrote the summary after feedback.'] + fields[SUMMARY + 1:]
+    new_job = ('Analytics Engineer', 'Company New', date(2024, 2, 1), None, True, 'Built the new pipeline.\nLed it.')
+    everything = None
+    return [
+        ('first render', fields + experiences, None, everything),
+        ('summary edit', edited + experiences, None, ['summary']),
+        ('reordered experiences', edited + experiences[::-1], None, []),
+        ('inserted experience', edited + [new_job] + experiences[::-1], None, ['experience:1']),
+        ('removed experience', edited + [new_job] + experiences[:0:-1], None, []),
+        ('template switch', edited + [new_job] + experiences, 'data_engineer', everything),
+        ('summary edit on the new template', fields + [new_job] + experiences, 'data_engineer', ['summary']),
+        ('switch back', fields + experiences, None, everything),
+    ]
+
+
+def test_incremental_renders_match_full_renders(candidate):
+    renderer = resume_generator.IncrementalRenderer()
+    for step, args, template, rebuilt in edit_session(candidate):
+        incremental = renderer.render(*args, cache=None, template=template)
+        assert incremental == resume_generator.generate_resume(*args, cache=None, template=template), step
+        if rebuilt is None:
+            rebuilt = [section_id for section_id, _ in resume_generator.resume_sections(*args, template=template)]
+        assert renderer.rebuilt == rebuilt, step
+
+
+def test_failed_render_leaves_the_session_intact(candidate):
+    renderer = resume_generator.IncrementalRenderer()
+    renderer.render(*candidate, cache=None)
+    template = resume_generator.load_template()
+    # A control character python-docx rejects, given as laid out rows so the spec's cleaning cannot remove it
+    sections = [(section_id, [(text + '\x0b' if section_id == 'summary' else text, formatting)
+                              for text, formatting in rows])
+                for section_id, rows in resume_generator.resume_sections(*candidate)]
+    with pytest.raises(ValueError):
+        renderer.render_sections(sections, template)
+    edited = list(candidate)
+    edited[SUMMARY] = 'A summary written after the failed render.'
+    for args in (edited, candidate):
+        assert renderer.render(*args, cache=None) == resume_generator.generate_resume(*args, cache=None)
@@ -0,0 +1,64 @@
+"""The streaming OOXML writer produces the same bytes as the python-docx backend."""
+import pytest
+
+import resume_generator
+from resume_spec import RESUME_FIELDS
+from resume_template import list_templates
+
+TRICKY_TEXT = {
+    'name': 'Zoë O\'Brien-Łukasz',
+    'city': '東京',
+    'summary': 'R&D lead for <platform> teams: "fast" & \'safe\' pipelines where a>b and c<d 🚀',
+    'degree': 'M.Sc.\tData Science',
+    'certifications': 'AWS & GCP <Associate>\n  Databricks\tSpark  \nČeský certifikát',
+}
+
+ROW_TEXTS = [
+    '   three leading spaces',
+    'trailing spaces   ',
+    'tab\tseparated\tcolumns',
+    'first line\nsecond line',
+    'windows\r\nline break',
+    'lone\rcarriage return',
+    '\n\nleading breaks',
+    ' \t mixed leading whitespace',
+    '',
+]
+
+
+# Function to replace some of a candidate's fields by name
+def with_fields(candidate, **fields):
+    args = list(candidate)
+    for field, value in fields.items():
+        args[RESUME_FIELDS.index(field)] = value
+    return args
+
+
+@pytest.mark.parametrize('template_name', list_templates())
+def test_backends_match_on_escaping_and_non_ascii(candidate, template_name):
+    args = with_fields(candidate, **TRICKY_TEXT)
+    assert resume_generator.generate_resume(*args, backend='ooxml', cache=None, template=template_name) == \
+        resume_generator.generate_resume(*args, backend='docx', cache=None, template=template_name)
+
+
+@pytest.mark.parametrize('text', ROW_TEXTS)
+def test_backends_match_on_whitespace_and_line_breaks(text):
+    # ResumeSpec trims its fields, so raw rows are the only way to reach the writers with leading spaces
+    rows = [('Heading', {'style': 'ResumeHeading1', 'is_heading': True}),
+            (text, {'style': 'ResumeBody'}),
+            (text, {'style': 'ResumeBody', 'align_bottom_left': True, 'is_border': True})]
+    assert resume_generator.ooxml_supports(rows)
+    assert resume_generator.render_resume(rows, backend='ooxml') == resume_generator.render_resume(rows, backend='docx')
+
+
+@pytest.mark.parametrize('character', ['\x00', '\x07', '\x0b', '\x0c', '\x1f', '\ud800', '￾'])
+def test_control_characters_fall_back_to_python_docx(character):
+    rows = [(f'bad {character} text', {'style': 'ResumeBody'})]
+    assert not resume_generator.ooxml_supports(rows)
+    # The ooxml backend hands the rows to python-docx rather than writing a corrupt package
+    with pytest.raises(ValueError) as docx_error:
+        resume_generator.render_resume(rows, backend='docx')
+    with pytest.raises(ValueError) as ooxml_error:
+        resume_generator.render_resume(rows, backend='ooxml')
+    assert type(ooxml_error.value) is type(docx_error.value)
+    assert str(ooxml_error.value) == str(docx_error.value)
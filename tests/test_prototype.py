@@ -0,0 +1,41 @@
+"""Renders cloned from the prebuilt document prototype match renders built from scratch."""
+import io
+import re
+import zipfile
+
+import pytest
+
+import resume_generator
+from resume_template import list_templates, load_template
+
+CORE_TIMESTAMPS = re.compile(rb'<(dcterms:created|dcterms:modified)\b[^>]*>[^<]*</\1>')
+
+
+# Function to read a .docx into {member name: bytes}, with the core properties' timestamps blanked
+def normalized_members(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as package:
+        return {name: CORE_TIMESTAMPS.sub(b'', package.read(name)) for name in package.namelist()}
+
+
+# Function to render rows without the prototype: a new Document() and python-docx's own row API
+def fresh_render(rows, styles):
+    doc, _ = resume_generator.styled_prototype.__wrapped__(styles)
+    for text, formatting in rows:
+        resume_generator.add_and_style_cell(doc.tables[0], text, **formatting)
+    return resume_generator.save_document(doc)
+
+
+@pytest.mark.parametrize('template_name', list_templates())
+def test_cloned_render_matches_fresh_document(candidate, template_name):
+    template = load_template(template_name)
+    rows = resume_generator.resume_rows(*candidate, template=template)
+    cloned = resume_generator.save_document(resume_generator.render_docx(rows, styles=template.styles))
+    assert normalized_members(cloned) == normalized_members(fresh_render(rows, template.styles))
+
+
+def test_clones_leave_the_prototype_untouched(candidate):
+    rows = resume_generator.resume_rows(*candidate)
+    first = resume_generator.save_document(resume_generator.render_docx(rows))
+    other = candidate[:22] + candidate[23:]
+    resume_generator.save_document(resume_generator.render_docx(resume_generator.resume_rows(*other)))
+    assert resume_generator.save_document(resume_generator.render_docx(rows)) == first